@@ -0,0 +1,38 @@
+"""
+Formatting helpers shared by the benchmark scripts.
+
+Benchmarks keep their measurements as integer nanoseconds and only format them here, when
+printing the results.
+"""
+
+
+def format_time(ns: int) -> str:
+    """Format a duration given in nanoseconds in a human-readable way."""
+    if ns < 1_000_000:
+        return f"{ns / 1000:.2f} μs"
+    elif ns < 1_000_000_000:
+        return f"{ns / 1_000_000:.2f} ms"
+    elif ns < 60_000_000_000:
+        return f"{ns / 1_000_000_000:.2f} s"
+    else:
+        minutes, rest = divmod(ns, 60_000_000_000)
+        return f"{minutes}m {rest / 1_000_000_000:.2f}s"
+
+
+def format_throughput(ops_per_sec: float) -> str:
+    """Format throughput in a human-readable way."""
+    if ops_per_sec >= 1_000_000:
+        return f"{ops_per_sec / 1_000_000:.2f} M ops/s"
+    elif ops_per_sec >= 1_000:
+        return f"{ops_per_sec / 1_000:.2f} K ops/s"
+    else:
+        return f"{ops_per_sec:.2f} ops/s"
+
+
+def format_bandwidth(num_bytes: int, ns: int) -> str:
+    """Format the rate at which num_bytes were moved in ns nanoseconds."""
+    bytes_per_sec = num_bytes * 1_000_000_000 / ns
+    if bytes_per_sec >= 1_000_000_000:
+        return f"{bytes_per_sec / 1_000_000_000:.2f} GB/s"
+    else:
+        return f"{bytes_per_sec / 1_000_000:.2f} MB/s"
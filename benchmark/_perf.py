@@ -0,0 +1,158 @@
+"""
+Hardware counters for the benchmark scripts (Linux only).
+
+Wall time mixes the work done with how fast the CPU happened to run it (frequency scaling,
+throttling, noisy neighbours); the number of instructions retired does not, and is stable from
+run to run. The counters are opened with the perf_event_open system call, through ctypes, as a
+group of two events read together: instructions and CPU cycles.
+
+They count the calling process only. Where they cannot be opened (another OS, an unsupported
+architecture, perf events disabled by kernel.perf_event_paranoid or by a container), the
+benchmarks run as before and simply report no counts.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import fcntl
+import os
+import platform
+import struct
+import sys
+from contextlib import contextmanager
+from typing import Iterator
+
+# perf_event_open syscall number, per architecture
+_NR_PERF_EVENT_OPEN = {"x86_64": 298, "aarch64": 241}
+
+PERF_TYPE_HARDWARE = 0
+PERF_COUNT_HW_CPU_CYCLES = 0
+PERF_COUNT_HW_INSTRUCTIONS = 1
+PERF_FORMAT_GROUP = 1 << 3
+
+# perf_event_attr.flags bits
+_DISABLED = 1 << 0
+_EXCLUDE_KERNEL = 1 << 5
+_EXCLUDE_HV = 1 << 6
+
+# ioctl requests, _IO('$', n), applied to the whole group
+PERF_EVENT_IOC_ENABLE = 0x2400
+PERF_EVENT_IOC_DISABLE = 0x2401
+PERF_EVENT_IOC_RESET = 0x2403
+PERF_IOC_FLAG_GROUP = 1
+
+
+class _PerfEventAttr(ctypes.Structure):
+    """The first version of struct perf_event_attr (PERF_ATTR_SIZE_VER0), all that is needed."""
+
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("config", ctypes.c_uint64),
+        ("sample_period", ctypes.c_uint64),
+        ("sample_type", ctypes.c_uint64),
+        ("read_format", ctypes.c_uint64),
+        ("flags", ctypes.c_uint64),
+        ("wakeup_events", ctypes.c_uint32),
+        ("bp_type", ctypes.c_uint32),
+        ("config1", ctypes.c_uint64),
+    ]
+
+
+class HardwareCounters:
+    """Instructions and cycles retired by the calling process, between enable and disable.
+
+    Usage:
+        counters = HardwareCounters()
+        with counters.counting():
+            ...  # timed section
+        counts = counters.read()  # (instructions, cycles), or None when unavailable
+    """
+
+    def __init__(self) -> None:
+        self._fds: list[int] = []
+        # Set to the reason the counters could not be opened, if they could not
+        self.unavailable: str | None = None
+        # True when only user space instructions are counted (the kernel refused the rest)
+        self.user_only = False
+        try:
+            self._open()
+        except OSError as e:
+            self.close()
+            self.unavailable = f"perf_event_open failed: {os.strerror(e.errno or 0)}"
+        except _Unsupported as e:
+            self.unavailable = str(e)
+
+    def _open(self) -> None:
+        if sys.platform != "linux":
+            raise _Unsupported(f"hardware counters are not supported on {sys.platform}")
+        nr = _NR_PERF_EVENT_OPEN.get(platform.machine())
+        if nr is None:
+            raise _Unsupported(f"hardware counters are not supported on {platform.machine()}")
+        libc = ctypes.CDLL(None, use_errno=True)
+
+        def perf_event_open(config: int, group_fd: int, exclude: int) -> int:
+            attr = _PerfEventAttr(
+                type=PERF_TYPE_HARDWARE,
+                size=ctypes.sizeof(_PerfEventAttr),
+                config=config,
+                read_format=PERF_FORMAT_GROUP,
+                # Only the group leader starts disabled: the others follow it
+                flags=exclude | (_DISABLED if group_fd == -1 else 0),
+            )
+            # pid 0, cpu -1: this process, on whatever CPU it runs
+            fd = libc.syscall(nr, ctypes.byref(attr), 0, -1, group_fd, 0)
+            if fd < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            return int(fd)
+
+        try:
+            leader = perf_event_open(PERF_COUNT_HW_INSTRUCTIONS, -1, _EXCLUDE_HV)
+        except OSError as e:
+            # With kernel.perf_event_paranoid >= 2 only user space may be counted
+            if e.errno not in (errno.EACCES, errno.EPERM):
+                raise
+            self.user_only = True
+        else:
+            os.close(leader)
+        exclude = _EXCLUDE_HV | (_EXCLUDE_KERNEL if self.user_only else 0)
+
+        self._fds.append(perf_event_open(PERF_COUNT_HW_INSTRUCTIONS, -1, exclude))
+        self._fds.append(perf_event_open(PERF_COUNT_HW_CPU_CYCLES, self._fds[0], exclude))
+
+    def __bool__(self) -> bool:
+        return bool(self._fds)
+
+    @contextmanager
+    def counting(self) -> Iterator[None]:
+        """Count, from zero, over the body of the with statement (a no-op when unavailable)."""
+        if not self._fds:
+            yield
+            return
+        leader = self._fds[0]
+        fcntl.ioctl(leader, PERF_EVENT_IOC_RESET, PERF_IOC_FLAG_GROUP)
+        fcntl.ioctl(leader, PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP)
+        try:
+            yield
+        finally:
+            fcntl.ioctl(leader, PERF_EVENT_IOC_DISABLE, PERF_IOC_FLAG_GROUP)
+
+    def read(self) -> tuple[int, int] | None:
+        """Return (instructions, cycles) counted by the last counting() block."""
+        if not self._fds:
+            return None
+        # PERF_FORMAT_GROUP: the number of events, then each event's value, in group order
+        data = os.read(self._fds[0], 8 * (1 + len(self._fds)))
+        _, instructions, cycles = struct.unpack("QQQ", data)
+        return instructions, cycles
+
+    def close(self) -> None:
+        for fd in reversed(self._fds):
+            os.close(fd)
+        self._fds.clear()
+
+
+class _Unsupported(Exception):
+    pass
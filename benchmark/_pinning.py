@@ -0,0 +1,27 @@
+"""
+CPU pinning shared by the benchmark scripts (Linux only).
+
+Client and server are kept on two fixed cores (ideally siblings sharing a cache) so the
+scheduler cannot migrate them mid-run, which shows up as noise in the SHM numbers. The cores
+come from the BENCH_CLIENT_CPU / BENCH_SERVER_CPU environment variables; a negative value
+disables pinning.
+"""
+
+import os
+
+CLIENT_CPU = int(os.environ.get("BENCH_CLIENT_CPU", "0"))
+SERVER_CPU = int(os.environ.get("BENCH_SERVER_CPU", "1"))
+
+
+def pin_to_core(cpu_id: int) -> None:
+    """Pin the calling process to a single CPU.
+
+    Call it first thing in each process, so that any threads started later on (gRPC's, for
+    instance) inherit the same affinity.
+    """
+    if cpu_id < 0 or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, {cpu_id})
+    except OSError as e:
+        print(f"  (could not pin process {os.getpid()} to CPU {cpu_id}: {e})")
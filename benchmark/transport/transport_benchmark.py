@@ -3,6 +3,7 @@
 Compares performance of raw transport layer byte array communication between processes:
 1. SharedMemoryTransportPosix (POSIX shared memory + semaphores)
 2. ZeroMQ IPC (ZeroMQ over Unix domain sockets)
+3. Unix domain sockets, used directly (the kernel cost ZeroMQ IPC builds upon)
 """
 
 from __future__ import annotations
@@ -12,17 +13,37 @@ import os
 # Allow access to internal APIs for benchmarking
 os.environ["SHM_RPC_BRIDGE_ALLOW_INTERNALS"] = "true"
 
+import json
 import logging
+import mmap
 import multiprocessing
+import socket
+import statistics
+import struct
+import sys
 import time
+from array import array
+from typing import Callable
 
 import zmq
 
+from shm_rpc_bridge.exceptions import RPCTimeoutError
 from shm_rpc_bridge.transport.transport_posix import SharedMemoryTransportPosix
 
+# Shared helpers live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _format import format_bandwidth, format_time
+from _perf import HardwareCounters
+from _pinning import CLIENT_CPU, SERVER_CPU, pin_to_core
+
 
 # Benchmark configuration
 NUM_ITERATIONS = 50_000  # Number of send/receive operations to make
+WARMUP_ITERATIONS = 2_000  # Untimed round trips made first, on the same channel and message
+SAMPLE_SIZE = 100  # Round trips timed together as one sample (keeps clock reads out of the way)
+ONE_WAY_BURST = 1_000  # Messages sent back to back, one-way, before waiting for a single ack
+PIPELINE_CHANNELS = 16  # SHM channels used side by side to keep that many round trips in flight
 MESSAGE_SIZES = {
     "small": 100,                    # 100 bytes
     "medium": 10_000,                # 10KB
@@ -33,6 +54,23 @@ MESSAGE_SIZES = {
 BUFFER_SIZE = 2_500_000  # 2.5MB buffer to accommodate all message sizes
 TIMEOUT = 10.0  # 10 seconds timeout
 
+# When set, one JSON record per measurement is appended to this file
+RESULTS_FILE = os.environ.get("BENCH_OUT")
+
+# From this size on the ZeroMQ client sends and receives messages without copying them into and
+# out of Python bytes (below it, the Frame bookkeeping costs more than the copy it saves)
+ZMQ_ZERO_COPY_MIN_SIZE = 65_536
+
+
+def make_message(message_size: int) -> memoryview:
+    """Build a test message in its own page-aligned anonymous mapping, with every page
+    already faulted in, so that the first round trips do not pay for it."""
+    buffer = mmap.mmap(-1, message_size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    buffer.write(b"A" * message_size)
+    if hasattr(buffer, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+        buffer.madvise(mmap.MADV_WILLNEED)
+    return memoryview(buffer)
+
 
 # ==============================================================================
 # Cleanup Helper
@@ -40,12 +78,12 @@ TIMEOUT = 10.0  # 10 seconds timeout
 
 def cleanup_posix_resources(name: str) -> None:
     try:
-        SharedMemoryTransportPosix.delete_resources()
+        SharedMemoryTransportPosix.delete_resources(name)
     except Exception:
         pass
 
 
-def cleanup_zmq_socket(socket_path: str) -> None:
+def cleanup_socket(socket_path: str) -> None:
     try:
         if os.path.exists(socket_path):
             os.unlink(socket_path)
@@ -53,81 +91,253 @@ def cleanup_zmq_socket(socket_path: str) -> None:
         pass
 
 
+# ==============================================================================
+# Server Processes
+# ==============================================================================
+# Each server runs for the whole benchmark, across all message sizes: none of them depends on
+# the size, and starting a fresh interpreter per measurement only adds spawn time and jitter.
+
+def start_server(target, *args) -> multiprocessing.Process:  # type: ignore
+    """Start target(*args, server_ready) in a new process; return once it is serving."""
+    server_ready: multiprocessing.Event = multiprocessing.Event()  # type: ignore
+    server_process = multiprocessing.Process(target=target, args=(*args, server_ready))
+    server_process.start()
+    if not server_ready.wait(timeout=5.0):
+        stop_server(server_process)
+        raise RuntimeError(f"{target.__name__} failed to start")
+    return server_process
+
+
+def stop_server(server_process: multiprocessing.Process) -> None:
+    server_process.terminate()
+    server_process.join(timeout=2.0)
+    if server_process.is_alive():
+        server_process.kill()
+        server_process.join()
+
+
+def waiting_through_timeouts(receive: Callable[[], bytes]) -> Callable[[], bytes]:
+    """Make a transport receive method wait for as long as it takes: a server sits idle, and
+    would otherwise time out, while the benchmarks of the other servers run."""
+    def receive_when_there() -> bytes:
+        while True:
+            try:
+                return receive()
+            except RPCTimeoutError:
+                pass
+
+    return receive_when_there
+
+
 # ==============================================================================
 # 1. SharedMemoryTransportPosix
 # ==============================================================================
 
-def run_posix_server(name: str) -> None:
+def run_posix_server(name: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
+    pin_to_core(SERVER_CPU)
 
     transport = SharedMemoryTransportPosix.create(
         name=name,
         buffer_size=BUFFER_SIZE,
         timeout=TIMEOUT,
     )
+    server_ready.set()
 
     try:
         # Echo back received messages
+        receive = waiting_through_timeouts(transport.receive_request)
+        send = transport.send_response
         while True:
-            data = transport.receive_request()
-            transport.send_response(data)
+            send(receive())
     except KeyboardInterrupt:
         pass
     finally:
         transport.close()
 
 
-def benchmark_posix(name: str, message_size: int) -> float:
-    """Benchmark POSIX IPC transport."""
+def _prepare_posix(name: str, message: memoryview) -> SharedMemoryTransportPosix:
+    """Open the client end of the channel and warm it up with the benchmark message."""
+    transport = SharedMemoryTransportPosix.open(
+        name=name,
+        buffer_size=BUFFER_SIZE,
+        timeout=TIMEOUT,
+        wait_for_creation=5.0,
+    )
+    try:
+        for _ in range(WARMUP_ITERATIONS):
+            transport.send_request(message)
+            _ = transport.receive_response()
+    except Exception:
+        transport.close()
+        raise
+    return transport
+
+
+def benchmark_posix(name: str, message_size: int, counters: HardwareCounters) -> array:
+    """Benchmark POSIX IPC transport; returns the nanoseconds taken by each sample."""
+    message = make_message(message_size)
+    transport = _prepare_posix(name, message)
+
+    try:
+        # Bound methods looked up once rather than on every iteration
+        send, receive = transport.send_request, transport.receive_response
+
+        # Benchmark
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // SAMPLE_SIZE):
+                start = clock()
+                for _ in range(SAMPLE_SIZE):
+                    send(message)
+                    _ = receive()
+                samples.append(clock() - start)
+
+        return samples
+    finally:
+        transport.close()
+
 
-    # Start server process
-    server_process = multiprocessing.Process(
-        target=run_posix_server,
-        args=(name,),
+def run_posix_sink(name: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
+    """Receive messages without answering them, acknowledging each burst once."""
+    pin_to_core(SERVER_CPU)
+
+    transport = SharedMemoryTransportPosix.create(
+        name=name,
+        buffer_size=BUFFER_SIZE,
+        timeout=TIMEOUT,
+    )
+    server_ready.set()
+
+    try:
+        receive = waiting_through_timeouts(transport.receive_request)
+        send = transport.send_response
+        while True:
+            for _ in range(ONE_WAY_BURST):
+                receive()
+            send(b"ack")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        transport.close()
+
+
+def benchmark_posix_one_way(name: str, message_size: int,
+                            counters: HardwareCounters) -> array:
+    """Benchmark one-way POSIX IPC transfers; returns the nanoseconds taken by each burst."""
+    message = make_message(message_size)
+    transport = SharedMemoryTransportPosix.open(
+        name=name,
+        buffer_size=BUFFER_SIZE,
+        timeout=TIMEOUT,
+        wait_for_creation=5.0,
     )
-    server_process.start()
 
     try:
-        # Create client transport
-        transport = SharedMemoryTransportPosix.open(
-            name=name,
+        send, receive = transport.send_request, transport.receive_response
+
+        for _ in range(WARMUP_ITERATIONS // ONE_WAY_BURST):
+            for _ in range(ONE_WAY_BURST):
+                send(message)
+            _ = receive()
+
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // ONE_WAY_BURST):
+                start = clock()
+                for _ in range(ONE_WAY_BURST):
+                    send(message)
+                _ = receive()
+                samples.append(clock() - start)
+
+        return samples
+    finally:
+        transport.close()
+
+
+def run_posix_multi_server(name: str, channels: int,
+                           server_ready: multiprocessing.Event) -> None:  # type: ignore
+    """Echo server over several channels, served in turn."""
+    pin_to_core(SERVER_CPU)
+
+    transports = [
+        SharedMemoryTransportPosix.create(
+            name=f"{name}_{i}",
             buffer_size=BUFFER_SIZE,
             timeout=TIMEOUT,
-            wait_for_creation=5.0,
         )
+        for i in range(channels)
+    ]
+    server_ready.set()
 
-        # Create test message
-        message = b"A" * message_size
-
-        # Warm-up
-        for _ in range(100):
-            transport.send_request(message)
-            _ = transport.receive_response()
+    try:
+        pairs = [(waiting_through_timeouts(t.receive_request), t.send_response)
+                 for t in transports]
+        while True:
+            for receive, send in pairs:
+                send(receive())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for transport in transports:
+            transport.close()
 
-        # Benchmark
-        start = time.perf_counter()
-        for _ in range(NUM_ITERATIONS):
-            transport.send_request(message)
-            _ = transport.receive_response()
-        end = time.perf_counter()
 
-        transport.close()
-        return end - start
+def benchmark_posix_multi_channel(name: str, message_size: int, counters: HardwareCounters,
+                                  channels: int = PIPELINE_CHANNELS) -> array:
+    """Benchmark POSIX IPC round trips with one request in flight on each of several channels.
 
+    A channel holds a single message per direction, so pipelining takes several of them: the
+    client sends on all, then collects all the answers, while the server is already echoing.
+    Returns the nanoseconds taken by each round over all the channels.
+    """
+    message = make_message(message_size)
+    transports: list[SharedMemoryTransportPosix] = []
+    try:
+        for i in range(channels):
+            transports.append(SharedMemoryTransportPosix.open(
+                name=f"{name}_{i}",
+                buffer_size=BUFFER_SIZE,
+                timeout=TIMEOUT,
+                wait_for_creation=5.0,
+            ))
+        sends = [t.send_request for t in transports]
+        receives = [t.receive_response for t in transports]
+
+        for _ in range(WARMUP_ITERATIONS // channels):
+            for send in sends:
+                send(message)
+            for receive in receives:
+                _ = receive()
+
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // channels):
+                start = clock()
+                for send in sends:
+                    send(message)
+                for receive in receives:
+                    _ = receive()
+                samples.append(clock() - start)
+
+        return samples
     finally:
-        # Stop server
-        server_process.terminate()
-        server_process.join(timeout=2.0)
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join()
+        for transport in transports:
+            transport.close()
 
 
 # ==============================================================================
 # ZeroMQ IPC Implementation
 # ==============================================================================
+# The servers always receive without copying and echo back the very frame they received:
+# that way they serve every message size the same, whatever the client does.
 
 def run_zmq_server(socket_path: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
     """Run ZeroMQ IPC server in a separate process."""
+    pin_to_core(SERVER_CPU)
+
     context = zmq.Context()
     socket = context.socket(zmq.REP)
     socket.bind(f"ipc://{socket_path}")
@@ -136,9 +346,9 @@ def run_zmq_server(socket_path: str, server_ready: multiprocessing.Event) -> Non
 
     try:
         # Echo back received messages
+        recv, send = socket.recv, socket.send
         while True:
-            message = socket.recv()
-            socket.send(message)
+            send(recv(copy=False), copy=False)
     except KeyboardInterrupt:
         pass
     finally:
@@ -146,94 +356,236 @@ def run_zmq_server(socket_path: str, server_ready: multiprocessing.Event) -> Non
         context.term()
 
 
-def benchmark_zmq(socket_path: str, message_size: int) -> float:
-    """Benchmark ZeroMQ IPC transport."""
-    server_ready: multiprocessing.Event = multiprocessing.Event()  # type: ignore
+def _prepare_zmq(socket_path: str, message: memoryview | zmq.Frame,
+                 copy: bool) -> tuple[zmq.Context, zmq.Socket]:
+    """Connect a client socket to the server and warm it up with the benchmark message."""
+    context = zmq.Context()
+    socket = context.socket(zmq.REQ)
+    try:
+        socket.connect(f"ipc://{socket_path}")
+        for _ in range(WARMUP_ITERATIONS):
+            socket.send(message, copy=copy)
+            _ = socket.recv(copy=copy)
+    except Exception:
+        socket.close()
+        context.term()
+        raise
+    return context, socket
 
-    # Clean up socket if it exists
-    cleanup_zmq_socket(socket_path)
 
-    # Start server process
-    server_process = multiprocessing.Process(
-        target=run_zmq_server,
-        args=(socket_path, server_ready),
-    )
-    server_process.start()
+def benchmark_zmq(socket_path: str, message_size: int, counters: HardwareCounters) -> array:
+    """Benchmark ZeroMQ IPC transport; returns the nanoseconds taken by each sample."""
+    zero_copy = message_size >= ZMQ_ZERO_COPY_MIN_SIZE
+
+    # Create test message; as a Frame it is handed to ZeroMQ by reference on every send
+    message = make_message(message_size)
+    if zero_copy:
+        message = zmq.Frame(message)
+    copy = not zero_copy
+    context, socket = _prepare_zmq(socket_path, message, copy)
 
-    # Wait for server to be ready
     try:
-        server_ready.wait(timeout=5.0)
-    except Exception as e:
-        server_process.terminate()
-        server_process.join()
-        raise RuntimeError(f"ZeroMQ server failed to start: {e}")
+        send, recv = socket.send, socket.recv
+
+        # Benchmark
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // SAMPLE_SIZE):
+                start = clock()
+                for _ in range(SAMPLE_SIZE):
+                    send(message, copy=copy)
+                    _ = recv(copy=copy)
+                samples.append(clock() - start)
+
+        return samples
+    finally:
+        socket.close()
+        context.term()
+
 
-    # Give server a moment to fully initialize
-    time.sleep(0.1)
+def run_zmq_sink(socket_path: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
+    """Receive ZeroMQ messages without answering them, acknowledging each burst once."""
+    pin_to_core(SERVER_CPU)
+
+    context = zmq.Context()
+    # PAIR rather than REP: nothing forces a reply between two receives
+    socket = context.socket(zmq.PAIR)
+    socket.bind(f"ipc://{socket_path}")
+
+    server_ready.set()
 
     try:
-        # Create client socket
-        context = zmq.Context()
-        socket = context.socket(zmq.REQ)
-        socket.connect(f"ipc://{socket_path}")
+        recv, send = socket.recv, socket.send
+        while True:
+            for _ in range(ONE_WAY_BURST):
+                recv(copy=False)
+            send(b"ack")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        socket.close()
+        context.term()
 
-        # Create test message
-        message = b"A" * message_size
 
-        # Warm-up
-        for _ in range(100):
-            socket.send(message)
-            _ = socket.recv()
+def benchmark_zmq_one_way(socket_path: str, message_size: int,
+                          counters: HardwareCounters) -> array:
+    """Benchmark one-way ZeroMQ IPC transfers; returns the nanoseconds taken by each burst."""
+    zero_copy = message_size >= ZMQ_ZERO_COPY_MIN_SIZE
 
-        # Benchmark
-        start = time.perf_counter()
-        for _ in range(NUM_ITERATIONS):
-            socket.send(message)
-            _ = socket.recv()
-        end = time.perf_counter()
+    message = make_message(message_size)
+    if zero_copy:
+        message = zmq.Frame(message)
+    copy = not zero_copy
 
+    context = zmq.Context()
+    socket = context.socket(zmq.PAIR)
+    try:
+        socket.connect(f"ipc://{socket_path}")
+        send, recv = socket.send, socket.recv
+
+        for _ in range(WARMUP_ITERATIONS // ONE_WAY_BURST):
+            for _ in range(ONE_WAY_BURST):
+                send(message, copy=copy)
+            _ = recv()
+
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // ONE_WAY_BURST):
+                start = clock()
+                for _ in range(ONE_WAY_BURST):
+                    send(message, copy=copy)
+                _ = recv()
+                samples.append(clock() - start)
+
+        return samples
+    finally:
         socket.close()
         context.term()
-        return end - start
 
+
+# ==============================================================================
+# Unix Domain Socket Implementation
+# ==============================================================================
+# A plain stream socket, each message preceded by its size (as in the SHM transport): what is
+# left of ZeroMQ IPC without ZeroMQ, and so the baseline for any socket based transport.
+
+UNIX_HEADER = struct.Struct("I")
+
+
+def _receive_exactly(recv_into: Callable[[memoryview], int], view: memoryview) -> bool:
+    """Fill view from the socket; return False if the peer closed it before sending anything."""
+    received = 0
+    while received < len(view):
+        n = recv_into(view[received:])
+        if n == 0:
+            if received == 0:
+                return False
+            raise ConnectionError("connection closed mid-message")
+        received += n
+    return True
+
+
+def run_unix_server(socket_path: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
+    """Echo server over a Unix domain socket, serving one client connection at a time."""
+    pin_to_core(SERVER_CPU)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(1)
+
+    server_ready.set()
+
+    header = memoryview(bytearray(UNIX_HEADER.size))
+    buffer = memoryview(bytearray(BUFFER_SIZE))
+    try:
+        while True:
+            connection, _ = listener.accept()
+            with connection:
+                recv_into, sendall = connection.recv_into, connection.sendall
+                while _receive_exactly(recv_into, header):
+                    data = buffer[:UNIX_HEADER.unpack(header)[0]]
+                    _receive_exactly(recv_into, data)
+                    sendall(header)
+                    sendall(data)
+    except KeyboardInterrupt:
+        pass
     finally:
-        # Stop server
-        server_process.terminate()
-        server_process.join(timeout=2.0)
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join()
+        listener.close()
 
-        # Clean up socket
-        cleanup_zmq_socket(socket_path)
+
+def benchmark_unix(socket_path: str, message_size: int, counters: HardwareCounters) -> array:
+    """Benchmark Unix domain socket transport; returns the nanoseconds taken by each sample."""
+    message = make_message(message_size)
+    header = UNIX_HEADER.pack(message_size)
+    response = memoryview(bytearray(UNIX_HEADER.size + message_size))
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        recv_into, sendall = client.recv_into, client.sendall
+
+        for _ in range(WARMUP_ITERATIONS):
+            sendall(header)
+            sendall(message)
+            _receive_exactly(recv_into, response)
+
+        samples = array("q")
+        clock = time.perf_counter_ns
+        with counters.counting():
+            for _ in range(NUM_ITERATIONS // SAMPLE_SIZE):
+                start = clock()
+                for _ in range(SAMPLE_SIZE):
+                    sendall(header)
+                    sendall(message)
+                    _receive_exactly(recv_into, response)
+                samples.append(clock() - start)
+
+        return samples
+    finally:
+        client.close()
 
 
 # ==============================================================================
 # Results Display
 # ==============================================================================
 
-def format_time(seconds: float) -> str:
-    """Format time in a human-readable way."""
-    if seconds < 0.001:
-        return f"{seconds * 1_000_000:.2f} μs"
-    elif seconds < 1:
-        return f"{seconds * 1000:.2f} ms"
-    elif seconds < 60:
-        return f"{seconds:.2f} s"
-    else:
-        minutes = int(seconds // 60)
-        secs = seconds % 60
-        return f"{minutes}m {secs:.2f}s"
-
-
-def format_throughput(ops_per_sec: float) -> str:
-    """Format throughput in a human-readable way."""
-    if ops_per_sec >= 1_000_000:
-        return f"{ops_per_sec / 1_000_000:.2f} M ops/s"
-    elif ops_per_sec >= 1_000:
-        return f"{ops_per_sec / 1_000:.2f} K ops/s"
-    else:
-        return f"{ops_per_sec:.2f} ops/s"
+def summarize(bench: str, message_size: int, samples: array,
+              ops_per_sample: int = SAMPLE_SIZE,
+              counts: tuple[int, int] | None = None) -> dict:
+    """Per operation statistics, in nanoseconds, over the samples of one measurement.
+
+    counts are the (instructions, cycles) retired by the client over all the samples, if known.
+    """
+    per_op = [sample / ops_per_sample for sample in samples]
+    iterations = len(samples) * ops_per_sample
+    record = {
+        "bench": bench,
+        "size": message_size,
+        "iterations": iterations,
+        "min_ns": min(per_op),
+        "median_ns": statistics.median(per_op),
+        "p99_ns": statistics.quantiles(per_op, n=100)[98],
+        "mean_ns": statistics.fmean(per_op),
+        "stddev_ns": statistics.stdev(per_op),
+    }
+    if counts:
+        instructions, cycles = counts
+        record["insn_per_op"] = instructions / iterations
+        record["cycles_per_op"] = cycles / iterations
+        record["insn_per_byte"] = instructions / (iterations * message_size)
+    return record
+
+
+def write_records(records: list[dict]) -> None:
+    """Append the records to RESULTS_FILE as JSON lines, if it is set."""
+    if not RESULTS_FILE:
+        return
+    with open(RESULTS_FILE, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {RESULTS_FILE}")
 
 # ==============================================================================
 # Main Benchmark
@@ -249,55 +601,118 @@ def main() -> None:
     print(f"Communication: Process-to-Process (raw byte arrays)")
     print()
 
-    # Paths for temporary resources
+    pin_to_core(CLIENT_CPU)
+
+    # Opened once, in the client only: they count the client's share of the work
+    counters = HardwareCounters()
+    if counters.unavailable:
+        print(f"Hardware counters: not reported ({counters.unavailable})")
+    elif counters.user_only:
+        print("Hardware counters: client process, user space only")
+    else:
+        print("Hardware counters: client process")
+    print()
+
+    # Names and paths for temporary resources
     posix_channel_name = "t_bench"
+    posix_sink_name = "t_bench_sink"
+    posix_multi_name = "t_bench_multi"
     zmq_socket_path = "/tmp/zt_bench.sock"
+    zmq_sink_socket_path = "/tmp/zt_bench_sink.sock"
+    unix_socket_path = "/tmp/ut_bench.sock"
+    socket_paths = (zmq_socket_path, zmq_sink_socket_path, unix_socket_path)
+    # Every SHM channel a server creates: the servers are terminated, so they never close
+    # (and unlink) their own transports
+    posix_channel_names = (
+        posix_channel_name,
+        posix_sink_name,
+        *(f"{posix_multi_name}_{i}" for i in range(PIPELINE_CHANNELS)),
+    )
 
     # Initial cleanup
     print("Cleaning up any leftover resources...")
-    cleanup_posix_resources(posix_channel_name)
-    cleanup_zmq_socket(zmq_socket_path)
+    for name in posix_channel_names:
+        cleanup_posix_resources(name)
+    for path in socket_paths:
+        cleanup_socket(path)
     print("Cleanup complete.\n")
 
-    results = {}
-
-    # Run benchmarks for each message size
-    for size_name, message_size in MESSAGE_SIZES.items():
-        print(f"\n{'='*70}")
-        print(f"Testing {size_name.upper()} messages ({message_size} bytes)")
-        print(f"{'='*70}")
-
-        # Benchmark POSIX IPC
-        print(f"\n[1/2] Running SHM POSIX benchmark...")
-        try:
-            posix_time = benchmark_posix(posix_channel_name, message_size)
-            print(f"      Completed in {format_time(posix_time)}")
-        except Exception as e:
-            print(f"✗ SHM POSIX benchmark failed: {e}")
-            posix_time = None
-
-        # Small delay between benchmarks
-        time.sleep(0.5)
-
-        # Benchmark ZeroMQ IPC
-        print(f"\n[2/2] Running ZeroMQ IPC benchmark...")
+    # (label, record name, benchmark function, server function, channel, ops per sample)
+    benchmarks = [
+        ("SHM POSIX", "shm_posix", benchmark_posix,
+         (run_posix_server, posix_channel_name), posix_channel_name, SAMPLE_SIZE),
+        ("ZeroMQ IPC", "zmq_ipc", benchmark_zmq,
+         (run_zmq_server, zmq_socket_path), zmq_socket_path, SAMPLE_SIZE),
+        ("Unix socket", "unix_socket", benchmark_unix,
+         (run_unix_server, unix_socket_path), unix_socket_path, SAMPLE_SIZE),
+        # One-way transfers: throughput rather than round trip latency
+        ("SHM POSIX one-way", "shm_posix_one_way", benchmark_posix_one_way,
+         (run_posix_sink, posix_sink_name), posix_sink_name, ONE_WAY_BURST),
+        ("ZeroMQ IPC one-way", "zmq_ipc_one_way", benchmark_zmq_one_way,
+         (run_zmq_sink, zmq_sink_socket_path), zmq_sink_socket_path, ONE_WAY_BURST),
+        (f"SHM POSIX pipelined ({PIPELINE_CHANNELS} channels)", "shm_posix_pipelined",
+         benchmark_posix_multi_channel,
+         (run_posix_multi_server, posix_multi_name, PIPELINE_CHANNELS), posix_multi_name,
+         PIPELINE_CHANNELS),
+    ]
+
+    print("Starting servers...")
+    servers = {}
+    for label, key, _, (server_fn, *server_args), _, _ in benchmarks:
         try:
-            zmq_time = benchmark_zmq(zmq_socket_path, message_size)
-            print(f"      Completed in {format_time(zmq_time)}")
+            servers[key] = start_server(server_fn, *server_args)
         except Exception as e:
-            print(f"✗ ZeroMQ IPC benchmark failed: {e}")
-            zmq_time = None
+            print(f"✗ {label} server failed to start: {e}")
+    print("Servers started.\n")
 
-        results[size_name] = {
-            "size": message_size,
-            "posix_time": posix_time,
-            "zmq_time": zmq_time,
-        }
+    results = {}
+    records = []
 
-        # Cleanup between tests
-        cleanup_posix_resources(posix_channel_name)
-        cleanup_zmq_socket(zmq_socket_path)
-        time.sleep(0.2)
+    try:
+        # Run benchmarks for each message size
+        for size_name, message_size in MESSAGE_SIZES.items():
+            print(f"\n{'='*70}")
+            print(f"Testing {size_name.upper()} messages ({message_size} bytes)")
+            print(f"{'='*70}")
+
+            times = {}
+            for i, (label, key, benchmark_fn, _, channel, ops_per_sample) in enumerate(
+                    benchmarks, 1):
+                print(f"\n[{i}/{len(benchmarks)}] Running {label} benchmark...")
+                times[key] = None
+                if key not in servers:
+                    print(f"✗ {label} benchmark skipped: no server")
+                    continue
+                try:
+                    samples = benchmark_fn(channel, message_size, counters)
+                    record = summarize(key, message_size, samples, ops_per_sample,
+                                       counters.read())
+                    records.append(record)
+                    times[key] = sum(samples)
+                    print(f"      Completed in {format_time(times[key])}")
+                    if "insn_per_op" in record:
+                        print(f"      {record['insn_per_op']:,.0f} insn/op, "
+                              f"{record['cycles_per_op']:,.0f} cycles/op, "
+                              f"{record['insn_per_byte']:.2f} insn/byte")
+                except Exception as e:
+                    print(f"✗ {label} benchmark failed: {e}")
+
+                # Small delay between benchmarks
+                time.sleep(0.5)
+
+            results[size_name] = {
+                "size": message_size,
+                "posix_time": times["shm_posix"],
+                "zmq_time": times["zmq_ipc"],
+                "unix_time": times["unix_socket"],
+                "posix_one_way_time": times["shm_posix_one_way"],
+                "zmq_one_way_time": times["zmq_ipc_one_way"],
+                "posix_pipelined_time": times["shm_posix_pipelined"],
+            }
+    finally:
+        for server_process in servers.values():
+            stop_server(server_process)
+        counters.close()
 
     # Overall summary
     print("\n\n" + "=" * 70)
@@ -309,22 +724,38 @@ def main() -> None:
         print(f"\n{size_name.capitalize()} ({msg_size} bytes):")
 
         if data["posix_time"]:
-            posix_lat = (data["posix_time"] / NUM_ITERATIONS) * 1_000_000
+            posix_lat = data["posix_time"] / NUM_ITERATIONS / 1000
             print(f"  SHM POSIX:   {posix_lat:.2f} μs/call")
 
-        if data["zmq_time"]:
-            zmq_lat = (data["zmq_time"] / NUM_ITERATIONS) * 1_000_000
-            percent_change = ((zmq_lat - posix_lat) / posix_lat) * 100
-            label = "faster" if percent_change < 0 else "slower"
-            diff_msg = f"({abs(percent_change):.1f}% {label})"
-            print(f" ZeroMQ IPC:  {zmq_lat:.2f} μs/call {diff_msg}")
+        for label, other_time in ((" ZeroMQ IPC", data["zmq_time"]),
+                                  ("Unix socket", data["unix_time"])):
+            if other_time:
+                other_lat = other_time / NUM_ITERATIONS / 1000
+                percent_change = ((other_lat - posix_lat) / posix_lat) * 100
+                change = "faster" if percent_change < 0 else "slower"
+                diff_msg = f"({abs(percent_change):.1f}% {change})"
+                print(f"{label}:  {other_lat:.2f} μs/call {diff_msg}")
+
+        if data["posix_pipelined_time"]:
+            pipelined_lat = data["posix_pipelined_time"] / NUM_ITERATIONS / 1000
+            print(f"  SHM POSIX pipelined:  {pipelined_lat:.2f} μs/call")
+
+        for label, one_way_time in (("  SHM POSIX", data["posix_one_way_time"]),
+                                    (" ZeroMQ IPC", data["zmq_one_way_time"])):
+            if one_way_time:
+                print(f"{label} one-way:  "
+                      f"{format_bandwidth(NUM_ITERATIONS * msg_size, one_way_time)}")
 
     print("\n" + "=" * 70)
 
+    write_records(records)
+
     # Final cleanup
     print("\nFinal cleanup...")
-    cleanup_posix_resources(posix_channel_name)
-    cleanup_zmq_socket(zmq_socket_path)
+    for name in posix_channel_names:
+        cleanup_posix_resources(name)
+    for path in socket_paths:
+        cleanup_socket(path)
     print("Done!")
 
 
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 """
 Compares performance of lightweight string message RPC calls between processes:
-1. SHM-RPC Bridge (shared memory + POSIX semaphores)
+1. SHM-RPC Bridge (shared memory + POSIX semaphores, or futexes when built with USE_FUTEX=1)
 2. gRPC over Unix Domain Sockets
 3. gRPC over TCP Sockets (using loopback)
+
+Both gRPC transports are measured with one unary call per message, and again with all the
+messages sent over a single bidirectional stream; SHM-RPC, likewise, is also measured with
+several calls in flight (RPCClient.call_many).
+
+With --histogram, the unary calls are also timed one by one, for latency percentiles.
 """
 
 from __future__ import annotations
@@ -13,13 +19,20 @@ import os
 # Allow access to internal APIs for benchmarking
 os.environ["SHM_RPC_BRIDGE_ALLOW_INTERNALS"] = "true"
 
+import argparse
+import itertools
 import logging
 import multiprocessing
+import statistics
 import sys
+import threading
 import time
+from array import array
 from concurrent import futures
+from typing import Callable
 
 import grpc
+import orjson
 
 from shm_rpc_bridge.transport.transport_chooser import SharedMemoryTransport
 
@@ -29,36 +42,76 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from shm_rpc_bridge import RPCClient, RPCServer
 
+from _format import format_throughput, format_time
+from _pinning import CLIENT_CPU, SERVER_CPU, pin_to_core
+
 # Import generated gRPC code
 import echo_pb2
 import echo_pb2_grpc
 
 # Benchmark configuration
 NUM_ITERATIONS = 50_000  # Number of RPC calls to make
+# Calls made before the timed ones: the first few, which set up connections (TCP handshake,
+# HTTP/2 settings exchange), are not timed at all; the rest, the warm-up, are timed apart, to
+# show one time costs (caches, buffer sizing, CPU frequency ramp) rather than hide them
+UNTIMED_CALLS = 10
+WARMUP_CALLS = 100
 MESSAGE_SIZES = {
     "small": "A" * 100,                              # 100 bytes
     "medium": "B" * 10_000,                          # 10KB
     "large": "C" * 500_000,                          # 500KB
     "big": "D" * 2_000_000,                          # 2MB
 }
+GRPC_POOL_SIZE = 4  # Channels (so connections) concurrent gRPC clients are spread over
 
+# fork is cheaper than spawn (the child does not re-import grpc, protobuf and this module),
+# but is only safe to rely on for this use on Linux. grpc is imported before the servers are
+# forked, but no channel or server exists in the parent until they all are
+mp = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else "spawn")
 
 # ==============================================================================
 # Cleanup Helper
 # ==============================================================================
 
 def cleanup_shm_resources(channel: str) -> None:
-    SharedMemoryTransport.delete_resources()
+    """Remove the IPC objects of channel, if left behind."""
+    SharedMemoryTransport.delete_resources(channel)
+
 
 def cleanup_uds_socket(socket_path: str) -> None:
     """Clean up Unix domain socket file."""
     try:
-        if os.path.exists(socket_path):
-            os.unlink(socket_path)
-    except Exception:
+        os.unlink(socket_path)
+    except FileNotFoundError:
         pass
 
 
+# ==============================================================================
+# Server Processes
+# ==============================================================================
+# Each server runs for the whole benchmark, across all message sizes: none of them depends on
+# the size, and starting (and importing into) a fresh interpreter per measurement only adds
+# spawn time and jitter.
+
+def start_server(target, *args) -> multiprocessing.Process:  # type: ignore
+    """Start target(*args, server_ready) in a new process; return once it is serving."""
+    server_ready: multiprocessing.Event = mp.Event()  # type: ignore
+    server_process = mp.Process(target=target, args=(*args, server_ready))
+    server_process.start()
+    if not server_ready.wait(timeout=5.0):
+        stop_server(server_process)
+        raise RuntimeError(f"{target.__name__} failed to start")
+    return server_process
+
+
+def stop_server(server_process: multiprocessing.Process) -> None:
+    server_process.terminate()
+    server_process.join(timeout=2.0)
+    if server_process.is_alive():
+        server_process.kill()
+        server_process.join()
+
+
 # ==============================================================================
 # gRPC Implementation
 # ==============================================================================
@@ -69,151 +122,199 @@ class EchoServicer(echo_pb2_grpc.EchoServiceServicer):
     def Echo(self, request, context):
         return echo_pb2.EchoResponse(message=request.message)
 
+    def EchoStream(self, request_iterator, context):
+        for request in request_iterator:
+            yield echo_pb2.EchoResponse(message=request.message)
 
-def run_grpc_server(socket_path: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
-    """Run gRPC server in a separate process."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
-    echo_pb2_grpc.add_EchoServiceServicer_to_server(EchoServicer(), server)
-
-    # Use Unix domain socket
-    server.add_insecure_port(f'unix://{socket_path}')
-    server.start()
-
-    server_ready.set()
 
-    try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
-        server.close(0)
-
-
-def run_grpc_tcp_server(port: int, server_ready: multiprocessing.Event) -> None:  # type: ignore
-    """Run gRPC server over TCP/IP in a separate process."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
-    echo_pb2_grpc.add_EchoServiceServicer_to_server(EchoServicer(), server)
-
-    # Use TCP/IP on localhost
-    server.add_insecure_port(f'localhost:{port}')
-    server.start()
+class PreEncodedEchoStub:
+    """Like echo_pb2_grpc.EchoServiceStub, but taking requests already serialized (as by
+    EchoRequest.SerializeToString), which are sent as they are."""
 
-    server_ready.set()
+    def __init__(self, channel: grpc.Channel) -> None:
+        self.Echo = channel.unary_unary(
+            "/echo.EchoService/Echo",
+            response_deserializer=echo_pb2.EchoResponse.FromString,
+        )
+        self.EchoStream = channel.stream_stream(
+            "/echo.EchoService/EchoStream",
+            response_deserializer=echo_pb2.EchoResponse.FromString,
+        )
 
-    try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
-        server.close(0)
 
+def echo_request(message: bytes, pre_encoded: bool) -> echo_pb2.EchoRequest | bytes:
+    """The request echoing message, serialized already if pre_encoded (for a
+    PreEncodedEchoStub)."""
+    request = echo_pb2.EchoRequest(message=message)
+    return request.SerializeToString() if pre_encoded else request
 
-def benchmark_grpc(message: str, socket_path: str) -> float:
-    """Benchmark gRPC over Unix domain sockets."""
-    server_ready: multiprocessing.Event = multiprocessing.Event()  # type: ignore
 
-    # Clean up socket if it exists
-    cleanup_uds_socket(socket_path)
+def time_warmup(echo_many: Callable[[int], None]) -> int:
+    """Make UNTIMED_CALLS calls with echo_many(n), then WARMUP_CALLS more; return the
+    nanoseconds taken by the latter."""
+    echo_many(UNTIMED_CALLS)
+    start = time.perf_counter_ns()
+    echo_many(WARMUP_CALLS)
+    return time.perf_counter_ns() - start
 
-    # Start server process
-    server_process = multiprocessing.Process(
-        target=run_grpc_server,
-        args=(socket_path, server_ready),
-    )
-    server_process.start()
 
-    # Wait for server to be ready
-    try:
-        server_ready.wait(timeout=5.0)
-    except Exception as e:
-        server_process.terminate()
-        server_process.join()
-        raise RuntimeError(f"gRPC server failed to start: {e}")
+def time_grpc_calls(stub: echo_pb2_grpc.EchoServiceStub | PreEncodedEchoStub,
+                    request: echo_pb2.EchoRequest | bytes, streaming: bool,
+                    per_call: bool = False) -> tuple[int, array]:
+    """Warm up, then time NUM_ITERATIONS echoes of request, either as that many unary calls
+    or over a single stream (which spares the per call stream setup, but also lets the
+    client send ahead of the answers).
 
-    # Give server a moment to fully initialize
-    time.sleep(0.1)
+    The message never changes, so neither does the request: it is built once, by the caller,
+    and reused by every call.
 
-    try:
-        # Create client channel
-        channel = grpc.insecure_channel(f'unix://{socket_path}')
-        stub = echo_pb2_grpc.EchoServiceStub(channel)
-
-        # Warm-up
-        for _ in range(100):
-            stub.Echo(echo_pb2.EchoRequest(message=message))
-
-        # Benchmark
-        start = time.perf_counter()
+    Returns the nanoseconds taken by the warm-up, and the nanoseconds taken by each call when
+    per_call (unary calls only), else by all of them, as a single sample.
+    """
+    if streaming:
+        def echo_many(n: int) -> None:
+            for _ in stub.EchoStream(itertools.repeat(request, n)):
+                pass
+    else:
+        def echo_many(n: int) -> None:
+            echo = stub.Echo
+            for _ in range(n):
+                echo(request)
+
+    warmup = time_warmup(echo_many)
+
+    # Benchmark
+    samples = array("q")
+    clock = time.perf_counter_ns
+    if per_call and not streaming:
+        echo = stub.Echo
         for _ in range(NUM_ITERATIONS):
-            response = stub.Echo(echo_pb2.EchoRequest(message=message))
-        end = time.perf_counter()
-
-        channel.close()
-        return end - start
+            start = clock()
+            echo(request)
+            samples.append(clock() - start)
+    else:
+        start = clock()
+        echo_many(NUM_ITERATIONS)
+        samples.append(clock() - start)
+    return warmup, samples
+
+
+class ChannelPool:
+    """A few channels to the same target, handed out in turn, so that concurrent callers do
+    not all queue on one HTTP/2 connection (and its flow control window)."""
+
+    def __init__(self, target: str, size: int = GRPC_POOL_SIZE,
+                 stub_class: type = echo_pb2_grpc.EchoServiceStub) -> None:
+        # Without a local subchannel pool, channels to the same target share one connection
+        self.channels = [
+            grpc.insecure_channel(target, options=[("grpc.use_local_subchannel_pool", 1)])
+            for _ in range(size)
+        ]
+        self.stubs = [stub_class(channel) for channel in self.channels]
+        self._next_stub = itertools.cycle(self.stubs)
+
+    def next_stub(self) -> echo_pb2_grpc.EchoServiceStub | PreEncodedEchoStub:
+        return next(self._next_stub)
+
+    def close(self) -> None:
+        for channel in self.channels:
+            channel.close()
+
+
+def time_grpc_calls_concurrently(pool: ChannelPool, request: echo_pb2.EchoRequest | bytes,
+                                 concurrency: int) -> tuple[int, array]:
+    """Time NUM_ITERATIONS unary echoes of request, shared among concurrency client threads
+    taking their stubs from pool; all the threads warm up, together, before the clock starts.
+
+    Returns the nanoseconds taken by the warm-up, in which every thread makes WARMUP_CALLS
+    calls side by side, scaled down to WARMUP_CALLS calls in all (as the timed calls are
+    counted in all), and the nanoseconds taken by all the calls, as a single sample.
+    """
+    calls_per_thread = NUM_ITERATIONS // concurrency
+    warming_up = threading.Barrier(concurrency + 1)
+    started = threading.Barrier(concurrency + 1)
+
+    def client() -> None:
+        echo = pool.next_stub().Echo
+        for _ in range(UNTIMED_CALLS):
+            echo(request)
+        warming_up.wait()
+        for _ in range(WARMUP_CALLS):
+            echo(request)
+        started.wait()
+        for _ in range(calls_per_thread):
+            echo(request)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    warming_up.wait()
+    warmup_start = time.perf_counter_ns()
+    started.wait()
+    start = time.perf_counter_ns()
+    for thread in threads:
+        thread.join()
+    return (start - warmup_start) // concurrency, array("q", [time.perf_counter_ns() - start])
+
+
+def time_grpc(target: str, message: bytes, streaming: bool, concurrency: int,
+              per_call: bool, pre_encoded: bool) -> tuple[int, array]:
+    """Connect to the gRPC server at target and time the echoes of message; pre_encoded,
+    the request is serialized once, rather than by every call."""
+    stub_class = PreEncodedEchoStub if pre_encoded else echo_pb2_grpc.EchoServiceStub
+    request = echo_request(message, pre_encoded)
+    if concurrency > 1 and not streaming:
+        pool = ChannelPool(target, stub_class=stub_class)
+        try:
+            for channel in pool.channels:
+                grpc.channel_ready_future(channel).result(timeout=2.0)
+            return time_grpc_calls_concurrently(pool, request, concurrency)
+        finally:
+            pool.close()
 
+    channel = grpc.insecure_channel(target)
+    try:
+        # Connected once the server listens, rather than after a guessed delay
+        grpc.channel_ready_future(channel).result(timeout=2.0)
+        return time_grpc_calls(stub_class(channel), request, streaming, per_call)
     finally:
-        # Stop server
-        server_process.terminate()
-        server_process.join(timeout=2.0)
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join()
-
-        # Clean up socket
-        cleanup_uds_socket(socket_path)
+        channel.close()
 
 
-def benchmark_grpc_tcp(message: str, port: int = 50051) -> float:
-    """Benchmark gRPC over TCP/IP."""
-    server_ready: multiprocessing.Event = multiprocessing.Event()  # type: ignore
+def run_grpc_server(address: str, workers: int,
+                    server_ready: multiprocessing.Event) -> None:  # type: ignore
+    """Run gRPC server in a separate process, listening on address (unix://path or
+    host:port)."""
+    pin_to_core(SERVER_CPU)
 
-    # Start server process
-    server_process = multiprocessing.Process(
-        target=run_grpc_tcp_server,
-        args=(port, server_ready),
-    )
-    server_process.start()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+    echo_pb2_grpc.add_EchoServiceServicer_to_server(EchoServicer(), server)
 
-    # Wait for server to be ready
-    try:
-        server_ready.wait(timeout=5.0)
-    except Exception as e:
-        server_process.terminate()
-        server_process.join()
-        raise RuntimeError(f"gRPC TCP server failed to start: {e}")
+    server.add_insecure_port(address)
+    server.start()
 
-    # Give server a moment to fully initialize
-    time.sleep(0.1)
+    server_ready.set()
 
     try:
-        # Create client channel
-        channel = grpc.insecure_channel(f'localhost:{port}')
-        stub = echo_pb2_grpc.EchoServiceStub(channel)
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.close(0)
 
-        # Warm-up
-        for _ in range(100):
-            stub.Echo(echo_pb2.EchoRequest(message=message))
 
-        # Benchmark
-        start = time.perf_counter()
-        for _ in range(NUM_ITERATIONS):
-            response = stub.Echo(echo_pb2.EchoRequest(message=message))
-        end = time.perf_counter()
-
-        channel.close()
-        return end - start
-
-    finally:
-        # Stop server
-        server_process.terminate()
-        server_process.join(timeout=2.0)
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join()
+def benchmark_grpc(message: bytes, address: str, streaming: bool = False,
+                   concurrency: int = 1, per_call: bool = False,
+                   pre_encoded: bool = False) -> tuple[int, array]:
+    """Benchmark gRPC against the server at address."""
+    return time_grpc(address, message, streaming, concurrency, per_call, pre_encoded)
 
 
 # ==============================================================================
 # SHM-RPC Implementation
 # ==============================================================================
 
-def run_shm_rpc_server(channel: str) -> None:  # type: ignore
+def run_shm_rpc_server(channel: str, server_ready: multiprocessing.Event) -> None:  # type: ignore
     """Run SHM-RPC server in a separate process."""
+    pin_to_core(SERVER_CPU)
 
     logging.getLogger("shm_rpc_bridge").setLevel(logging.ERROR)
 
@@ -224,102 +325,108 @@ def run_shm_rpc_server(channel: str) -> None:  # type: ignore
         return message
 
     server.register("echo", echo)
-    server.start()
+    server.start(ready_callback=server_ready.set)
 
 
-def benchmark_shm_rpc(message: str, channel: str) -> float:
-    """Benchmark SHM-RPC bridge."""
-
-    # Start server process
-    server_process = multiprocessing.Process(
-        target=run_shm_rpc_server,
-        args=(channel,),
-    )
-    server_process.start()
+def benchmark_shm_rpc(message: str, channel: str, pipelined: bool = False,
+                      per_call: bool = False, pre_encoded: bool = False) -> tuple[int, array]:
+    """Benchmark SHM-RPC bridge; pipelined, the calls are sent ahead of their results.
+    pre_encoded (and not pipelined), the parameters are JSON-encoded once, rather than by
+    every call.
 
+    Returns the nanoseconds taken by the warm-up, and the nanoseconds taken by each call when
+    per_call (unless pipelined), else by all of them, as a single sample.
+    """
+    client = RPCClient(channel, buffer_size=2_500_000, timeout=10.0)
     try:
-        # Create client
-        client = RPCClient(channel, buffer_size=2_500_000, timeout=10.0, wait_for_server=5.0)
-
-        # Warm-up
-        for _ in range(100):
-            client.call("echo", message=message)
+        if pipelined:
+            call_many = client.call_many
+            kwargs = {"message": message}
+
+            def echo_many(n: int) -> None:
+                call_many("echo", itertools.repeat(kwargs, n))
+        else:
+            if pre_encoded:
+                call, method = client.call_raw, "echo"
+                params = orjson.dumps({"message": message})
+            else:
+                # The leanest call the client offers: method id instead of name, positional
+                # parameters, all looked up once
+                call, method, params = client.call_positional, client.bind("echo"), message
+
+            def echo_many(n: int) -> None:
+                for _ in range(n):
+                    call(method, params)
+
+        warmup = time_warmup(echo_many)
 
         # Benchmark
-        start = time.perf_counter()
-        for _ in range(NUM_ITERATIONS):
-            _ = client.call("echo", message=message)
-        end = time.perf_counter()
-
-        client.close()
-        return end - start
-
+        samples = array("q")
+        clock = time.perf_counter_ns
+        if per_call and not pipelined:
+            for _ in range(NUM_ITERATIONS):
+                start = clock()
+                call(method, params)
+                samples.append(clock() - start)
+        else:
+            start = clock()
+            echo_many(NUM_ITERATIONS)
+            samples.append(clock() - start)
+
+        return warmup, samples
     finally:
-        # Stop server
-        server_process.terminate()
-        server_process.join(timeout=5.0)
+        client.close()
 
 # ==============================================================================
 # Results Display
 # ==============================================================================
 
-def format_time(seconds: float) -> str:
-    """Format time in a human-readable way."""
-    if seconds < 0.001:
-        return f"{seconds * 1_000_000:.2f} μs"
-    elif seconds < 1:
-        return f"{seconds * 1000:.2f} ms"
-    elif seconds < 60:
-        return f"{seconds:.2f} s"
-    else:
-        minutes = int(seconds // 60)
-        secs = seconds % 60
-        return f"{minutes}m {secs:.2f}s"
+def format_warmup(warmup: int, elapsed: int) -> str:
+    """Mean time per warm-up call, and how it compares to the mean time per timed call."""
+    warmup_mean = warmup / WARMUP_CALLS
+    ratio = warmup_mean / (elapsed / NUM_ITERATIONS)
+    return f"{format_time(round(warmup_mean))}/call ({ratio:.2f}x the timed calls)"
 
 
-def format_throughput(ops_per_sec: float) -> str:
-    """Format throughput in a human-readable way."""
-    if ops_per_sec >= 1_000_000:
-        return f"{ops_per_sec / 1_000_000:.2f} M ops/s"
-    elif ops_per_sec >= 1_000:
-        return f"{ops_per_sec / 1_000:.2f} K ops/s"
-    else:
-        return f"{ops_per_sec:.2f} ops/s"
+def format_percentiles(samples: array) -> str:
+    """Latency percentiles of per call samples, in nanoseconds."""
+    percentiles = statistics.quantiles(samples, n=100)
+    return ", ".join(
+        f"p{p}: {format_time(round(percentiles[p - 1]))}" for p in (50, 95, 99)
+    )
 
 
 def print_comparison(
     size_name: str,
-    message: str,
-    shm_time: float | None,
-    grpc_uds_time: float | None,
-    grpc_tcp_time: float | None,
+    msg_size: int,
+    shm_time: int | None,
+    grpc_uds_time: int | None,
+    grpc_tcp_time: int | None,
 ) -> None:
-    """Print comparison results for a specific message size."""
-    msg_size = len(message.encode("utf-8"))
-
+    """Print comparison results for a specific message size (times in nanoseconds)."""
     print(f"\n{'='*70}")
     print(f"{size_name.upper()} MESSAGE ({msg_size} bytes)")
     print(f"{'='*70}")
 
     if shm_time:
-        shm_throughput = NUM_ITERATIONS / shm_time
-        shm_latency_us = (shm_time / NUM_ITERATIONS) * 1_000_000
+        shm_throughput = NUM_ITERATIONS * 1_000_000_000 / shm_time
+        shm_latency_us = shm_time / NUM_ITERATIONS / 1000
         print(f"\nSHM-RPC Bridge:")
         print(f"  Total time:    {format_time(shm_time)}")
         print(f"  Throughput:    {format_throughput(shm_throughput)}")
         print(f"  Avg latency:   {shm_latency_us:.2f} μs/call")
 
     if grpc_uds_time:
-        grpc_uds_throughput = NUM_ITERATIONS / grpc_uds_time
-        grpc_uds_latency_us = (grpc_uds_time / NUM_ITERATIONS) * 1_000_000
+        grpc_uds_throughput = NUM_ITERATIONS * 1_000_000_000 / grpc_uds_time
+        grpc_uds_latency_us = grpc_uds_time / NUM_ITERATIONS / 1000
         print(f"\ngRPC (Unix Domain Sockets):")
         print(f"  Total time:    {format_time(grpc_uds_time)}")
         print(f"  Throughput:    {format_throughput(grpc_uds_throughput)}")
         print(f"  Avg latency:   {grpc_uds_latency_us:.2f} μs/call")
 
     if grpc_tcp_time:
-        grpc_tcp_throughput = NUM_ITERATIONS / grpc_tcp_time
-        grpc_tcp_latency_us = (grpc_tcp_time / NUM_ITERATIONS) * 1_000_000
+        grpc_tcp_throughput = NUM_ITERATIONS * 1_000_000_000 / grpc_tcp_time
+        grpc_tcp_latency_us = grpc_tcp_time / NUM_ITERATIONS / 1000
         print(f"\ngRPC (TCP/IP localhost):")
         print(f"  Total time:    {format_time(grpc_tcp_time)}")
         print(f"  Throughput:    {format_throughput(grpc_tcp_throughput)}")
@@ -339,8 +446,12 @@ def print_comparison(
 # Main Benchmark
 # ==============================================================================
 
-def main() -> None:
-    """Run the benchmark suite."""
+def main(concurrency: int = 1, per_call: bool = False, pre_encoded: bool = False) -> None:
+    """Run the benchmark suite; with concurrency > 1, unary gRPC calls are made from that many
+    client threads, over a pool of GRPC_POOL_SIZE channels. With per_call, single threaded
+    unary calls are timed one by one, and their latency percentiles reported. With
+    pre_encoded, the unary calls of both SHM-RPC and gRPC send requests encoded once, ahead
+    of the timed loop, so that only the transport and the server are measured."""
 
     logging.getLogger("shm_rpc_bridge").setLevel(logging.ERROR)
 
@@ -349,11 +460,21 @@ def main() -> None:
     print("=" * 70)
     print(f"Iterations per test: {NUM_ITERATIONS:,}")
     print(f"Communication: Process-to-Process")
+    # Picked when the package was built: compare the two by running once per build
+    print(f"SHM-RPC transport: {SharedMemoryTransport.__name__}")
+    if concurrency > 1:
+        print(f"Concurrent gRPC clients (unary calls): {concurrency}, "
+              f"over {GRPC_POOL_SIZE} channels")
+    if pre_encoded:
+        print("Unary requests: pre-encoded (serialized once, outside the timed loop)")
     print()
 
+    pin_to_core(CLIENT_CPU)
+
     # Paths for temporary resources
     socket_path = "/tmp/grpc_benchmark.sock"
-    tcp_port = 50051
+    uds_address = f"unix://{socket_path}"
+    tcp_address = "localhost:50051"
     shm_channel = "shm_bench"
 
     # Initial cleanup
@@ -362,60 +483,78 @@ def main() -> None:
     cleanup_shm_resources(shm_channel)
     print("Cleanup complete.\n")
 
-    results = {}
-
-    # Run benchmarks for each message size
-    for size_name, message in MESSAGE_SIZES.items():
-        print(f"\n{'='*70}")
-        print(
-            f"Testing {size_name.upper()} messages ({len(message.encode('utf-8'))} bytes)"
-        )
-        print(f"{'='*70}")
-
-        # Benchmark SHM-RPC
-        print(f"\n[1/3] Running SHM-RPC benchmark...")
-        try:
-            shm_time = benchmark_shm_rpc(message, shm_channel)
-            print(f"      Completed in {format_time(shm_time)}")
-        except Exception as e:
-            print(f"✗ SHM-RPC benchmark failed: {e}")
-            shm_time = None
-
-        # Small delay between benchmarks
-        time.sleep(0.5)
-
-        # Benchmark gRPC UDS
-        print(f"\n[2/3] Running gRPC (UDS) benchmark...")
+    print("Starting servers...")
+    servers = {}
+    for server, (server_fn, *server_args) in {
+        "shm": (run_shm_rpc_server, shm_channel),
+        "grpc_uds": (run_grpc_server, uds_address, concurrency),
+        "grpc_tcp": (run_grpc_server, tcp_address, concurrency),
+    }.items():
         try:
-            grpc_uds_time = benchmark_grpc(message, socket_path)
-            print(f"      Completed in {format_time(grpc_uds_time)}")
+            servers[server] = start_server(server_fn, *server_args)
         except Exception as e:
-            print(f"✗ gRPC (UDS) benchmark failed: {e}")
-            grpc_uds_time = None
+            print(f"✗ {server} server failed to start: {e}")
+    print("Servers started.\n")
+
+    # (label, result key, server, benchmark taking the message as text and as UTF-8 bytes):
+    # gRPC carries it as a bytes field, sparing a UTF-8 validation pass per message, while
+    # SHM-RPC, whose payloads are JSON, carries the text
+    benchmarks = [
+        ("SHM-RPC", "shm_time", "shm",
+         lambda text, data: benchmark_shm_rpc(text, shm_channel, per_call=per_call,
+                                              pre_encoded=pre_encoded)),
+        ("gRPC (UDS)", "grpc_uds_time", "grpc_uds",
+         lambda text, data: benchmark_grpc(data, uds_address, concurrency=concurrency,
+                                           per_call=per_call, pre_encoded=pre_encoded)),
+        ("gRPC (TCP)", "grpc_tcp_time", "grpc_tcp",
+         lambda text, data: benchmark_grpc(data, tcp_address, concurrency=concurrency,
+                                           per_call=per_call, pre_encoded=pre_encoded)),
+        ("gRPC (UDS, streaming)", "grpc_uds_stream_time", "grpc_uds",
+         lambda text, data: benchmark_grpc(data, uds_address, streaming=True)),
+        ("gRPC (TCP, streaming)", "grpc_tcp_stream_time", "grpc_tcp",
+         lambda text, data: benchmark_grpc(data, tcp_address, streaming=True)),
+        ("SHM-RPC (pipelined)", "shm_pipelined_time", "shm",
+         lambda text, data: benchmark_shm_rpc(text, shm_channel, pipelined=True)),
+    ]
 
-        # Small delay between benchmarks
-        time.sleep(0.5)
-
-        # Benchmark gRPC TCP
-        print(f"\n[3/3] Running gRPC (TCP) benchmark...")
-        try:
-            grpc_tcp_time = benchmark_grpc_tcp(message, tcp_port)
-            print(f"      Completed in {format_time(grpc_tcp_time)}")
-        except Exception as e:
-            print(f"✗ gRPC (TCP) benchmark failed: {e}")
-            grpc_tcp_time = None
-
-        results[size_name] = {
-            "message": message,
-            "shm_time": shm_time,
-            "grpc_uds_time": grpc_uds_time,
-            "grpc_tcp_time": grpc_tcp_time,
-        }
+    results = {}
 
-        # Cleanup between tests
-        cleanup_shm_resources(shm_channel)
-        cleanup_uds_socket(socket_path)
-        time.sleep(0.2)
+    try:
+        # Run benchmarks for each message size
+        for size_name, message in MESSAGE_SIZES.items():
+            # Encoded once here, not on every call: the big message takes megabytes
+            payload = message.encode("utf-8")
+            msg_size = len(payload)
+
+            print(f"\n{'='*70}")
+            print(f"Testing {size_name.upper()} messages ({msg_size} bytes)")
+            print(f"{'='*70}")
+
+            results[size_name] = {"size": msg_size}
+            for i, (label, key, server, benchmark_fn) in enumerate(benchmarks, 1):
+                if i > 1:
+                    # Small delay between benchmarks
+                    time.sleep(0.5)
+
+                print(f"\n[{i}/{len(benchmarks)}] Running {label} benchmark...")
+                if server not in servers:
+                    print(f"✗ {label} benchmark skipped: no server")
+                    results[size_name][key] = None
+                    continue
+                try:
+                    warmup, samples = benchmark_fn(message, payload)
+                    elapsed = sum(samples)
+                    print(f"      Completed in {format_time(elapsed)}")
+                    print(f"      Warm-up: {format_warmup(warmup, elapsed)}")
+                    if len(samples) > 1:
+                        print(f"      Per call: {format_percentiles(samples)}")
+                except Exception as e:
+                    print(f"✗ {label} benchmark failed: {e}")
+                    elapsed = None
+                results[size_name][key] = elapsed
+    finally:
+        for server_process in servers.values():
+            stop_server(server_process)
 
     # Overall summary
     print("\n\n" + "=" * 70)
@@ -423,21 +562,30 @@ def main() -> None:
     print("=" * 70)
 
     for size_name, data in results.items():
-        msg_size = len(data["message"].encode("utf-8"))
+        msg_size = data["size"]
         print(f"\n{size_name.capitalize()} ({msg_size} bytes):")
 
         if data["shm_time"]:
-            shm_lat = (data["shm_time"] / NUM_ITERATIONS) * 1_000_000
+            shm_lat = data["shm_time"] / NUM_ITERATIONS / 1000
             print(f"  SHM-RPC:    {shm_lat:.2f} μs/call")
 
         if data["grpc_uds_time"]:
-            grpc_uds_lat = (data["grpc_uds_time"] / NUM_ITERATIONS) * 1_000_000
+            grpc_uds_lat = data["grpc_uds_time"] / NUM_ITERATIONS / 1000
             print(f"  gRPC (UDS): {grpc_uds_lat:.2f} μs/call")
 
         if data["grpc_tcp_time"]:
-            grpc_tcp_lat = (data["grpc_tcp_time"] / NUM_ITERATIONS) * 1_000_000
+            grpc_tcp_lat = data["grpc_tcp_time"] / NUM_ITERATIONS / 1000
             print(f"  gRPC (TCP): {grpc_tcp_lat:.2f} μs/call")
 
+        for label, key in (("UDS", "grpc_uds_stream_time"), ("TCP", "grpc_tcp_stream_time")):
+            if data[key]:
+                stream_lat = data[key] / NUM_ITERATIONS / 1000
+                print(f"  gRPC ({label}, streaming): {stream_lat:.2f} μs/call")
+
+        if data["shm_pipelined_time"]:
+            shm_pipelined_lat = data["shm_pipelined_time"] / NUM_ITERATIONS / 1000
+            print(f"  SHM-RPC (pipelined): {shm_pipelined_lat:.2f} μs/call")
+
     print("\n" + "=" * 70)
 
     # Final cleanup
@@ -448,8 +596,19 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    # Ensure we're using 'spawn' method for multiprocessing
-    # This is more similar to how processes would be used in production
-    multiprocessing.set_start_method('spawn', force=True)
-    main()
+    parser = argparse.ArgumentParser(description="SHM-RPC Bridge vs gRPC benchmark")
+    parser.add_argument(
+        "--concurrency", type=int, default=1,
+        help="client threads making the unary gRPC calls (default: 1)",
+    )
+    parser.add_argument(
+        "--histogram", action="store_true",
+        help="time unary calls one by one and report p50/p95/p99 latencies",
+    )
+    parser.add_argument(
+        "--pre-encoded", action="store_true",
+        help="encode the unary requests once, outside the timed loop (SHM-RPC and gRPC)",
+    )
+    args = parser.parse_args()
+    main(concurrency=args.concurrency, per_call=args.histogram, pre_encoded=args.pre_encoded)
 
@@ -40,6 +40,11 @@ class EchoServiceStub(object):
                 request_serializer=echo__pb2.EchoRequest.SerializeToString,
                 response_deserializer=echo__pb2.EchoResponse.FromString,
                 _registered_method=True)
+        self.EchoStream = channel.stream_stream(
+                '/echo.EchoService/EchoStream',
+                request_serializer=echo__pb2.EchoRequest.SerializeToString,
+                response_deserializer=echo__pb2.EchoResponse.FromString,
+                _registered_method=True)
 
 
 class EchoServiceServicer(object):
@@ -52,6 +57,13 @@ class EchoServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def EchoStream(self, request_iterator, context):
+        """Same echo, over a single stream kept open for many messages
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_EchoServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -60,6 +72,11 @@ def add_EchoServiceServicer_to_server(servicer, server):
                     request_deserializer=echo__pb2.EchoRequest.FromString,
                     response_serializer=echo__pb2.EchoResponse.SerializeToString,
             ),
+            'EchoStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.EchoStream,
+                    request_deserializer=echo__pb2.EchoRequest.FromString,
+                    response_serializer=echo__pb2.EchoResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'echo.EchoService', rpc_method_handlers)
@@ -98,3 +115,30 @@ class EchoService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def EchoStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/echo.EchoService/EchoStream',
+            echo__pb2.EchoRequest.SerializeToString,
+            echo__pb2.EchoResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -13,11 +13,14 @@ from shm_rpc_bridge import RPCServer
 class Accumulator:
     """A simple accumulator service with a table of accumulated values per client."""
 
-    totals: dict[str, float] = {}
+    def __init__(self) -> None:
+        # Per instance: a class attribute would be one table shared by every accumulator
+        self.totals: dict[str, float] = {}
 
     def accumulate(self, client_id: str, val: float) -> float:
-        self.totals[client_id] = self.totals.get(client_id, 0.0) + val
-        return self.totals[client_id]
+        total = self.totals.get(client_id, 0.0) + val
+        self.totals[client_id] = total
+        return total
 
     def clear(self, client_id: str) -> None:
         del self.totals[client_id]
@@ -6,56 +6,66 @@ This server implements a calculator with basic arithmetic operations
 that can be called remotely via RPC over shared memory.
 """
 
+import logging
+import sys
+
 from shm_rpc_bridge import RPCServer
 
+logger = logging.getLogger(__name__)
+
+
 class Calculator:
     """A simple calculator with arithmetic operations."""
 
     def add(self, a: float, b: float) -> float:
         """Add two numbers."""
         result = a + b
-        print(f"add({a}, {b}) = {result}")
+        logger.info("add(%s, %s) = %s", a, b, result)
         return result
 
     def subtract(self, a: float, b: float) -> float:
         """Subtract b from a."""
         result = a - b
-        print(f"subtract({a}, {b}) = {result}")
+        logger.info("subtract(%s, %s) = %s", a, b, result)
         return result
 
     def multiply(self, a: float, b: float) -> float:
         """Multiply two numbers."""
         result = a * b
-        print(f"multiply({a}, {b}) = {result}")
+        logger.info("multiply(%s, %s) = %s", a, b, result)
         return result
 
     def divide(self, a: float, b: float) -> float:
         """Divide a by b."""
         if b == 0:
-            print(f"divide({a}, {b}) - Division by zero!")
+            logger.info("divide(%s, %s) - Division by zero!", a, b)
             raise ValueError("Cannot divide by zero")
         result = a / b
-        print(f"divide({a}, {b}) = {result}")
+        logger.info("divide(%s, %s) = %s", a, b, result)
         return result
 
     def power(self, base: float, exponent: float) -> float:
         """Raise base to the power of exponent."""
         result = base ** exponent
-        print(f"power({base}, {exponent}) = {result}")
+        logger.info("power(%s, %s) = %s", base, exponent, result)
         return result
 
     def sqrt(self, x: float) -> float:
         """Calculate the square root of x."""
         if x < 0:
-            print(f"sqrt({x}) - Cannot calculate square root of negative number!")
+            logger.info("sqrt(%s) - Cannot calculate square root of negative number!", x)
             raise ValueError("Cannot calculate square root of negative number")
         result = x ** 0.5
-        print(f"sqrt({x}) = {result}")
+        logger.info("sqrt(%s) = %s", x, result)
         return result
 
 
 def main() -> None:
     """Run the calculator RPC server."""
+    # Each call is logged at INFO, to stdout; raise this level to keep logging off the calls
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
     channel_name = "calc_rpc"
 
     print("Starting Calculator RPC Server...")
@@ -1,27 +1,49 @@
 #!/usr/bin/env python3
 import cProfile
+import itertools
 import os
 import pstats
 import sys
 
+import orjson
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from shm_rpc_bridge import RPCClient
 
 
-def run_client(name: str, buffer_size: int, iterations: int):
+def run_client(
+    name: str, buffer_size: int, iterations: int, pipelined: bool = False, cprofile: bool = True
+):
     client = RPCClient(name, buffer_size=buffer_size, timeout=10.0)
     message = "x" * 2_000_000
-    profiler = cProfile.Profile()
+    # The message never changes: its parameters are JSON-encoded once, here, so that the
+    # profile shows the round trip rather than re-encoding the same 2 MB on every call
+    params = orjson.dumps({"message": message})
+    call_raw = client.call_raw
+    # Without cProfile the loop runs at full speed, to be sampled from outside (py-spy)
+    profiler = cProfile.Profile() if cprofile else None
 
     # issue first call as a signal to the server to start profiling
-    client.call("echo", message=message)
+    call_raw("echo", params)
+
+    if profiler:
+        profiler.enable()
+    if pipelined:
+        # up to RPCClient.MAX_IN_FLIGHT calls outstanding, so that the server is already
+        # handling the next call while this client decodes a result
+        client.call_many("echo", itertools.repeat({"message": message}, iterations))
+    else:
+        for _ in range(iterations):
+            call_raw("echo", params)
+    if profiler:
+        profiler.disable()
+        print_stats(profiler)
+
+    client.close()
 
-    profiler.enable()
-    for i in range(iterations):
-        client.call("echo", message=message)
-    profiler.disable()
 
+def print_stats(profiler: cProfile.Profile):
     profiler.dump_stats("client_profile.prof")
     # Print profiling statistics
     print("\n" + "=" * 80)
@@ -34,14 +56,17 @@ def run_client(name: str, buffer_size: int, iterations: int):
     print("=" * 80)
     print("Client profile saved to client_profile.prof")
 
-    client.close()
-
 
 if __name__ == "__main__":
     if len(sys.argv) < 4:
-        print("Usage: python `profiling/echo_client.py` <name> <buffer_size> <iterations>")
+        print(
+            "Usage: python `profiling/echo_client.py` <name> <buffer_size> <iterations>"
+            " [--pipelined] [--no-cprofile]"
+        )
         sys.exit(1)
     name = sys.argv[1]
     buffer_size = int(sys.argv[2])
     iterations = int(sys.argv[3])
-    run_client(name, buffer_size, iterations)
+    pipelined = "--pipelined" in sys.argv[4:]
+    cprofile = "--no-cprofile" not in sys.argv[4:]
+    run_client(name, buffer_size, iterations, pipelined, cprofile)
@@ -13,7 +13,7 @@ def echo(message: str) -> str:
     return message
 
 
-def run_server(name: str, buffer_size: int, iterations: int):
+def run_server(name: str, buffer_size: int, iterations: int, cprofile: bool = True):
     server = RPCServer(name, buffer_size=buffer_size, timeout=10.0)
     server.register("echo", echo)
 
@@ -21,15 +21,23 @@ def run_server(name: str, buffer_size: int, iterations: int):
     while not server._handle_request():
         pass
 
-    profiler = cProfile.Profile()
+    # Without cProfile the loop runs at full speed, to be sampled from outside (py-spy)
+    profiler = cProfile.Profile() if cprofile else None
     count = 0
-    profiler.enable()
+    if profiler:
+        profiler.enable()
     while count < iterations:
         server._handle_request()
         count += 1
-    profiler.disable()
+    if profiler:
+        profiler.disable()
     server.close()
 
+    if profiler:
+        print_stats(profiler)
+
+
+def print_stats(profiler: cProfile.Profile):
     profiler.dump_stats("server_profile.prof")
     # Print profiling statistics
     print("\n" + "=" * 80)
@@ -45,9 +53,13 @@ def run_server(name: str, buffer_size: int, iterations: int):
 
 if __name__ == "__main__":
     if len(sys.argv) < 4:
-        print("Usage: python `profiling/echo_server.py` <name> <buffer_size> <iterations>")
+        print(
+            "Usage: python `profiling/echo_server.py` <name> <buffer_size> <iterations>"
+            " [--no-cprofile]"
+        )
         sys.exit(1)
     name = sys.argv[1]
     buffer_size = int(sys.argv[2])
     iterations = int(sys.argv[3])
-    run_server(name, buffer_size, iterations)
+    cprofile = "--no-cprofile" not in sys.argv[4:]
+    run_server(name, buffer_size, iterations, cprofile)
@@ -3,25 +3,49 @@ set -e
 
 cd "$(dirname "$0")"
 
-rm -f server_profile.prof client_profile.prof
+rm -f server_profile.prof client_profile.prof server_profile.svg client_profile.svg
 
 NAME="profile"
 BUFFER_SIZE=2500000 #2.5 MB
 ITERATIONS=30000
 
+# py-spy samples the processes from outside, so the loops run at full speed; cProfile hooks
+# every function call, which inflates (and skews) the cost of small functions. cProfile is
+# used when py-spy is not installed, or when asked for with --cprofile.
+USE_PYSPY=""
+CLIENT_ARGS=()
+for arg in "$@"; do
+    case "$arg" in
+        --cprofile) FORCE_CPROFILE=1 ;;
+        *) CLIENT_ARGS+=("$arg") ;;
+    esac
+done
+if [ -z "$FORCE_CPROFILE" ] && command -v py-spy >/dev/null 2>&1; then
+    USE_PYSPY=1
+fi
+
 echo "Profiling..."
-python echo_server.py $NAME $BUFFER_SIZE $ITERATIONS 2>&1 &
-SERVER_PID=$!
-sleep 2
-python echo_client.py $NAME $BUFFER_SIZE $ITERATIONS 2>&1
+if [ -n "$USE_PYSPY" ]; then
+    py-spy record -o server_profile.svg -r 500 -- \
+        python echo_server.py $NAME $BUFFER_SIZE $ITERATIONS --no-cprofile 2>&1 &
+    SERVER_PID=$!
+    sleep 2
+    py-spy record -o client_profile.svg -r 500 -- \
+        python echo_client.py $NAME $BUFFER_SIZE $ITERATIONS --no-cprofile "${CLIENT_ARGS[@]}" 2>&1
+else
+    python echo_server.py $NAME $BUFFER_SIZE $ITERATIONS 2>&1 &
+    SERVER_PID=$!
+    sleep 2
+    python echo_client.py $NAME $BUFFER_SIZE $ITERATIONS "${CLIENT_ARGS[@]}" 2>&1
+fi
 wait $SERVER_PID 2>/dev/null || true
 echo ""
 echo "Profiling complete!"
 echo ""
 echo "To view results, run:"
-echo "  snakeviz server_profile.prof"
-echo "  snakeviz client_profile.prof"
-
-
-
-
+if [ -n "$USE_PYSPY" ]; then
+    echo "  open server_profile.svg and client_profile.svg (flame graphs) in a browser"
+else
+    echo "  snakeviz server_profile.prof"
+    echo "  snakeviz client_profile.prof"
+fi
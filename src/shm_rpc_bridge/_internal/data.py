@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Sequence
 
 import orjson
 
@@ -24,8 +24,10 @@ class RPCRequest:
     """Represents an RPC request."""
 
     request_id: str
-    method: str
-    params: dict[str, Any]
+    # a method name, or a numeric id obtained from RPCClient.bind
+    method: str | int
+    # keyword parameters, or positional ones when sent by RPCClient.call_positional
+    params: dict[str, Any] | Sequence[Any]
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -80,7 +82,7 @@ class Serdes(ABC):
         pass
 
     @abstractmethod
-    def deserialize(self, data: bytes) -> Any:
+    def deserialize(self, data: bytes | memoryview) -> Any:
         pass
 
 
@@ -93,7 +95,7 @@ class JSONSerdes(Serdes):
         except (TypeError, ValueError) as e:
             raise RPCSerializationError(f"Failed to serialize data: {e}") from e
 
-    def deserialize(self, data: bytes) -> Any:
+    def deserialize(self, data: bytes | memoryview) -> Any:
         try:
             return orjson.loads(data)
         except (orjson.JSONDecodeError, UnicodeDecodeError) as e:
@@ -106,19 +108,49 @@ class JSONSerdes(Serdes):
 
 
 class RPCCodec:
-    """Codec for encoding/decoding RPC messages using JSON."""
+    """Codec for encoding/decoding RPC messages using JSON.
+
+    On the wire a message is a JSON array holding its fields in declaration order, e.g.
+    ``["<request_id>", "add", [1, 2]]``: no field names to write or parse, and decoding
+    builds the message straight from the array instead of going through a dict.
+    """
 
     def __init__(self) -> None:
         self._serdes = JSONSerdes()
 
     def encode_request(self, request: RPCRequest) -> bytes:
-        return self._serdes.serialize(request.to_dict())
+        return self.encode_call(request.request_id, request.method, request.params)
+
+    def encode_call(
+        self, request_id: str, method: str | int, params: dict[str, Any] | Sequence[Any]
+    ) -> bytes:
+        """Encode a request from its fields, without building an RPCRequest first (the
+        client's per-call path)."""
+        return self._serdes.serialize((request_id, method, params))
+
+    def encode_request_raw(
+        self, request_id: str, method: str, params: bytes | bytearray | memoryview
+    ) -> tuple[bytes | bytearray | memoryview, ...]:
+        """Encode a request whose params are already JSON-encoded (see RPCClient.call_raw).
+
+        Returned as the parts of the message, in order, so that the params can be copied
+        straight into the transport without first joining everything into a new buffer.
+        """
+        return (
+            b"[",
+            self._serdes.serialize(request_id),
+            b",",
+            self._serdes.serialize(method),
+            b",",
+            params,
+            b"]",
+        )
 
-    def decode_request(self, data: bytes) -> RPCRequest:
-        return RPCRequest.from_dict(self._serdes.deserialize(data))
+    def decode_request(self, data: bytes | memoryview) -> RPCRequest:
+        return RPCRequest(*self._serdes.deserialize(data))
 
     def encode_response(self, response: RPCResponse) -> bytes:
-        return self._serdes.serialize(response.to_dict())
+        return self._serdes.serialize((response.request_id, response.result, response.error))
 
-    def decode_response(self, data: bytes) -> RPCResponse:
-        return RPCResponse.from_dict(self._serdes.deserialize(data))
+    def decode_response(self, data: bytes | memoryview) -> RPCResponse:
+        return RPCResponse(*self._serdes.deserialize(data))
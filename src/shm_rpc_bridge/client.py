@@ -4,11 +4,13 @@ RPC client implementation.
 
 from __future__ import annotations
 
+import itertools
 import logging
 import uuid
-from typing import Any
+from collections import deque
+from typing import Any, ClassVar, Iterable
 
-from shm_rpc_bridge._internal.data import RPCCodec, RPCRequest
+from shm_rpc_bridge._internal.data import RPCCodec
 from shm_rpc_bridge.exceptions import RPCError, RPCMethodError
 from shm_rpc_bridge.transport.transport_chooser import SharedMemoryTransport
 
@@ -18,6 +20,10 @@ logger = logging.getLogger(__name__)
 class RPCClient:
     """RPC client using shared memory transport."""
 
+    # One call waiting in the request buffer, one being executed by the server and one
+    # answered in the response buffer: a fourth send would wait for a reap() that never comes.
+    MAX_IN_FLIGHT: ClassVar[int] = 3
+
     def __init__(
         self,
         name: str,
@@ -39,6 +45,12 @@ class RPCClient:
             name=name, buffer_size=buffer_size, timeout=timeout, wait_for_creation=wait_for_server
         )
         self._codec: RPCCodec = RPCCodec()
+        # Request ids: random once per client, so that a response left behind by another
+        # client's timed out call is still told apart, then counted
+        self._id_prefix = f"{uuid.uuid4().hex[:12]}-"
+        self._id_counter = itertools.count(1)
+        # ids of the calls sent by submit() whose results have not been reaped yet
+        self._in_flight: deque[str] = deque()
 
     def call(self, method: str, **params: Any) -> Any:
         """
@@ -56,22 +68,196 @@ class RPCClient:
             RPCMethodError: If the remote method raises an error
         """
         # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        request_id = f"{self._id_prefix}{next(self._id_counter)}"
+
+        return self._exchange(request_id, self._codec.encode_call(request_id, method, params))
+
+    def bind(self, method: str) -> int:
+        """
+        Look up a numeric id for a method, to be passed to call_positional() in its place.
+
+        The server then finds the method by indexing instead of hashing its name, and the
+        name is kept off the wire. Ids are valid for as long as the server runs.
+
+        Args:
+            method: Name of the method to bind
+
+        Returns:
+            The method id
+
+        Raises:
+            RPCError: If the call fails
+            RPCMethodError: If the server has no such method
+        """
+        method_id: int = self.call_positional("__bind__", method)
+        return method_id
+
+    def call_positional(self, method: str | int, *args: Any) -> Any:
+        """
+        Make an RPC call passing the parameters positionally.
+
+        The parameters travel as a JSON array instead of an object, which spares building
+        a kwargs dict on both ends and keeps parameter names off the wire.
+
+        Args:
+            method: Name of the method to call, or its id as returned by bind()
+            *args: Method parameters, in the order the method declares them
+
+        Returns:
+            The result from the server
 
-        # Create request
-        request = RPCRequest(
-            request_id=request_id,
-            method=method,
-            params=params,
+        Raises:
+            RPCError: If the call fails
+            RPCMethodError: If the remote method raises an error
+        """
+        request_id = f"{self._id_prefix}{next(self._id_counter)}"
+        return self._exchange(request_id, self._codec.encode_call(request_id, method, args))
+
+    def call_batch(self, calls: Iterable[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """
+        Make several RPC calls in a single round trip.
+
+        All calls travel to the server in one request and are executed there in order, so
+        N calls cost one request/response exchange instead of N. The whole batch, and all
+        of its results, must fit in the channel's buffers.
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            The results, in the same order as the calls
+
+        Raises:
+            RPCError: If the call fails
+            RPCMethodError: If one of the remote methods raises an error; the calls before
+                it have been executed, the calls after it have not
+        """
+        results: list[Any] = self.call("__batch__", calls=list(calls))
+        return results
+
+    def call_raw(self, method: str, params: bytes | bytearray | memoryview) -> Any:
+        """
+        Make an RPC call whose parameters are already JSON-encoded.
+
+        Useful when the same arguments are sent over and over: encode them once, e.g. with
+        ``orjson.dumps({"data": data})``, and reuse the bytes so that every call skips
+        re-serializing them. Any contiguous bytes-like object will do, e.g. a memoryview of part
+        of a larger buffer: it is copied straight into shared memory, without a bytes copy first.
+
+        Args:
+            method: Name of the method to call
+            params: JSON object mapping parameter names to values, as a bytes-like object
+
+        Returns:
+            The result from the server
+
+        Raises:
+            RPCError: If the call fails
+            RPCMethodError: If the remote method raises an error
+        """
+        self._check_nothing_in_flight()
+        request_id = f"{self._id_prefix}{next(self._id_counter)}"
+        self._transport.send_request_parts(
+            self._codec.encode_request_raw(request_id, method, params)
         )
+        return self._receive_result(request_id)
+
+    def submit(self, method: str, **params: Any) -> None:
+        """
+        Send an RPC call without waiting for its result, which is collected later by reap().
+
+        Keeps the server busy with the next call while this client is still busy with the
+        previous result. A single channel holds one request and one response, so at most
+        MAX_IN_FLIGHT calls can be outstanding: reap() before submitting more.
+
+        Reap within the server's timeout: while an earlier result waits in the response
+        buffer, the server waits to hand over the next one, and drops it once its timeout
+        expires (reap() then raises RPCTimeoutError for that call).
+
+        Args:
+            method: Name of the method to call
+            **params: Method parameters as keyword arguments
+
+        Raises:
+            RPCError: If the call cannot be sent or too many calls are in flight
+        """
+        if len(self._in_flight) >= self.MAX_IN_FLIGHT:
+            raise RPCError(f"Already {self.MAX_IN_FLIGHT} calls in flight, reap() one first")
+        request_id = f"{self._id_prefix}{next(self._id_counter)}"
+        self._transport.send_request(self._codec.encode_call(request_id, method, params))
+        self._in_flight.append(request_id)
+
+    def call_many(self, method: str, params: Iterable[dict[str, Any]]) -> list[Any]:
+        """
+        Make the same RPC call once per set of parameters, keeping several calls in flight.
+
+        Unlike call_batch(), every call travels as a request of its own, so the calls need
+        not fit in the buffers all together; they are submitted ahead of their results, up
+        to MAX_IN_FLIGHT at a time, so the server is already executing the next call while
+        this client collects a result.
+
+        Args:
+            method: Name of the method to call
+            params: Method parameters of each call, as keyword-argument dicts
+
+        Returns:
+            The results, in the same order as the calls
+
+        Raises:
+            RPCError: If a call fails
+            RPCMethodError: If one of the remote methods raises an error; the calls sent
+                before it have been collected, no more calls are sent after it
+        """
+        self._check_nothing_in_flight()
+        results: list[Any] = []
+        submit, reap = self.submit, self.reap
+        try:
+            for call_params in params:
+                if len(self._in_flight) == self.MAX_IN_FLIGHT:
+                    results.append(reap())
+                submit(method, **call_params)
+            while self._in_flight:
+                results.append(reap())
+        except RPCMethodError:
+            # collect the answers still due, so that the channel is left ready for new calls
+            while self._in_flight:
+                try:
+                    reap()
+                except RPCMethodError:
+                    pass
+            raise
+        return results
+
+    def reap(self) -> Any:
+        """
+        Wait for the result of the oldest call sent by submit().
+
+        Returns:
+            The result from the server
+
+        Raises:
+            RPCError: If the call fails or no call is in flight
+            RPCMethodError: If the remote method raises an error
+            RPCTimeoutError: If the result does not arrive in time, e.g. because it was reaped
+                too late and the server dropped it (see submit())
+        """
+        if not self._in_flight:
+            raise RPCError("No calls in flight")
+        return self._receive_result(self._in_flight.popleft())
+
+    def _check_nothing_in_flight(self) -> None:
+        # the next response would belong to a submitted call, not to this one
+        if self._in_flight:
+            raise RPCError("Calls submitted but not reaped yet")
 
-        # Encode and send request
-        request_data = self._codec.encode_request(request)
+    def _exchange(self, request_id: str, request_data: bytes) -> Any:
+        self._check_nothing_in_flight()
         self._transport.send_request(request_data)
+        return self._receive_result(request_id)
 
-        # Receive and decode response
-        response_data = self._transport.receive_response()
-        response = self._codec.decode_response(response_data)
+    def _receive_result(self, request_id: str) -> Any:
+        # Receive and decode response (straight from shared memory)
+        response = self._transport.receive_response_with(self._codec.decode_response)
 
         # Verify request ID matches
         if response.request_id != request_id:
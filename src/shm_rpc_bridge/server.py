@@ -7,7 +7,7 @@ from __future__ import annotations
 import logging
 import signal
 from enum import Enum
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 
 from shm_rpc_bridge._internal.data import RPCCodec, RPCRequest, RPCResponse
 from shm_rpc_bridge.exceptions import RPCError, RPCTimeoutError, RPCTransportError
@@ -35,6 +35,21 @@ class RPCServer:
     def __running__() -> bool:
         return True
 
+    def __batch__(self, calls: list[list[Any]]) -> list[Any]:
+        """Execute several (method, params) calls in order; backs RPCClient.call_batch."""
+        return [self._dispatch(method, params) for method, params in calls]
+
+    def __bind__(self, method: str) -> int:
+        """Hand out a numeric id that stands for *method* in later calls; backs RPCClient.bind."""
+        method_id = self._bound_ids.get(method)
+        if method_id is None:
+            func = self._methods.get(method)
+            if func is None:
+                raise RPCError(f"Unknown method: {method}")
+            method_id = self._bound_ids[method] = len(self._bound)
+            self._bound.append(func)
+        return method_id
+
     @staticmethod
     def _assert_no_resources_left_behind(server_name: str) -> None:
         SharedMemoryTransport.assert_no_resources_left_behind(server_name)
@@ -57,6 +72,9 @@ class RPCServer:
         self._transport: SharedMemoryTransport | None = None
         self._codec: RPCCodec | None = None
         self._methods: dict[str, Callable[..., Any]] = {}
+        # methods handed out by __bind__, indexed by their numeric id
+        self._bound: list[Callable[..., Any]] = []
+        self._bound_ids: dict[str, int] = {}
         self._running: bool = False
         self._signal_handler: _SignalHandler | None = None
 
@@ -67,6 +85,8 @@ class RPCServer:
             self._transport = SharedMemoryTransport.create(name, buffer_size, timeout)
             self._codec = RPCCodec()
             self.register("__running__", self.__running__)
+            self.register("__batch__", self.__batch__)
+            self.register("__bind__", self.__bind__)
         except Exception:
             if self._transport is not None:
                 self._transport.close()
@@ -74,6 +94,10 @@ class RPCServer:
 
     def register(self, name: str, func: Callable[..., Any]) -> None:
         self._methods[name] = func
+        # a method re-registered after being bound keeps its id, now standing for func
+        method_id = self._bound_ids.get(name)
+        if method_id is not None:
+            self._bound[method_id] = func
         logger.info("[Server %s]: registered method %s", self.name, name)
 
     def register_function(self, func: Callable[..., Any]) -> Callable[..., Any]:
@@ -81,15 +105,21 @@ class RPCServer:
         self.register(func.__name__, func)
         return func
 
-    def start(self) -> None:
+    def start(self, ready_callback: Callable[[], None] | None = None) -> None:
         """
         Start the server and handle requests in a loop.
 
         This will block until close() is called (in another thread) or an error occurs.
+
+        Args:
+            ready_callback: Called once the server is about to wait for its first request,
+                e.g. to let a parent process know that clients can start calling
         """
         assert self._transport is not None
         logger.info("[Server %s]: started", self.name)
         self._running = True
+        if ready_callback is not None:
+            ready_callback()
 
         try:
             while self._running:
@@ -130,8 +160,7 @@ class RPCServer:
             assert self._codec is not None
             encoded_request = self._codec.encode_request(RPCRequest("0", "__running__", {}))
             probe_transport.send_request(encoded_request)
-            encoded_response = probe_transport.receive_response()
-            response = self._codec.decode_response(encoded_response)
+            response = probe_transport.receive_response_with(self._codec.decode_response)
             return self.Status.RUNNING if response.error is None else self.Status.ERROR
         except RPCError:
             return self.Status.ERROR
@@ -139,10 +168,12 @@ class RPCServer:
             if probe_transport is not None:
                 probe_transport.close()
 
-    def _receive_request(self) -> bytes | None:
+    def _receive_request(self) -> RPCRequest | None:
         assert self._transport is not None
+        assert self._codec is not None
         try:
-            return self._transport.receive_request()
+            # Decoded straight from shared memory
+            return self._transport.receive_request_with(self._codec.decode_request)
         # ignore as the normal consequence of waiting for a request that hasn't arrived yet
         except RPCTimeoutError:
             return None
@@ -153,25 +184,20 @@ class RPCServer:
                 raise e
 
     def _handle_request(self) -> RPCResponse | None:
-        data = self._receive_request()
-        if data is None:
+        request = self._receive_request()
+        if request is None:
             return None
 
-        assert self._codec is not None
-        request = self._codec.decode_request(data)
         logger.debug(
-            "[Server %s]: received request : %s",
+            "[Server %s]: received request : %s (%s)",
             self.name,
-            f"{request.method} ({request.request_id})",
+            request.method,
+            request.request_id,
         )
 
         # Execute method and create response
         try:
-            if request.method not in self._methods:
-                raise RPCError(f"Unknown method: {request.method}")
-
-            method = self._methods[request.method]
-            result = method(**request.params)
+            result = self._dispatch(request.method, request.params)
 
             response = RPCResponse(
                 request_id=request.request_id,
@@ -201,19 +227,33 @@ class RPCServer:
             )
             self._transport.send_response(response_data)
         except RPCTimeoutError as e:
-            # Timeout sending response is a REAL error - client not reading
-            logger.error(
-                "[Server %s]: Timeout sending response % : %s",
+            # The client is not reading (gone, or reaping its submitted calls late): drop the
+            # response and keep serving, rather than stop the server for every client. The
+            # client's wait for it times out in turn
+            logger.warning(
+                "[Server %s]: Timeout sending response %s, dropped: %s",
                 self.name,
                 request.request_id,
                 str(e),
             )
-            raise
+            return None
 
         logger.debug("[Server %s]: Response %s sent", self.name, request.request_id)
 
         return response
 
+    def _dispatch(self, method_name: str | int, params: dict[str, Any] | Sequence[Any]) -> Any:
+        if type(method_name) is int:
+            bound = self._bound
+            method = bound[method_name] if 0 <= method_name < len(bound) else None
+        else:
+            method = self._methods.get(method_name)  # type: ignore[arg-type]
+        if method is None:
+            raise RPCError(f"Unknown method: {method_name}")
+        if isinstance(params, dict):
+            return method(**params)
+        return method(*params)
+
     def __enter__(self) -> RPCServer:
         return self
 
@@ -8,6 +8,7 @@
 #include <time.h>
 #include <stdatomic.h>
 #include <stdbool.h>
+#include <limits.h>
 
 // (Written by AI)
 
@@ -31,6 +32,12 @@ static inline int futex_wake(uint32_t *addr, int n) {
 #define CPU_RELAX() do { } while (0)
 #endif
 
+// Top bit of the word flags that somebody is (about to be) blocked in FUTEX_WAIT on it.
+// Writers only pay for the FUTEX_WAKE syscall when it is set, so an uncontended
+// hand-off (the peer is still spinning, or not waiting yet) costs no syscalls at all.
+#define WAITERS_BIT 0x80000000u
+#define VALUE_MASK (~WAITERS_BIT)
+
 // ---------------------------------------------------------------------
 // FutexWord type
 // ---------------------------------------------------------------------
@@ -73,7 +80,7 @@ static void FutexWord_dealloc(FutexWordObject *self) {
 }
 
 static PyObject *FutexWord_load(FutexWordObject *self, PyObject *Py_UNUSED(ignored)) {
-    uint32_t val = __atomic_load_n(self->uaddr, __ATOMIC_ACQUIRE);
+    uint32_t val = __atomic_load_n(self->uaddr, __ATOMIC_ACQUIRE) & VALUE_MASK;
     return PyLong_FromUnsignedLong(val);
 }
 
@@ -82,10 +89,28 @@ static PyObject *FutexWord_store(FutexWordObject *self, PyObject *args) {
     if (!PyArg_ParseTuple(args, "k", &value)) {
         return NULL;
     }
-    __atomic_store_n(self->uaddr, (uint32_t)value, __ATOMIC_RELEASE);
+    __atomic_store_n(self->uaddr, (uint32_t)value & VALUE_MASK, __ATOMIC_RELEASE);
     Py_RETURN_NONE;
 }
 
+// store_and_wake(value) -> int: publish value and wake all waiters, if there are any
+static PyObject *FutexWord_store_and_wake(FutexWordObject *self, PyObject *args) {
+    unsigned long value;
+    if (!PyArg_ParseTuple(args, "k", &value)) {
+        return NULL;
+    }
+    uint32_t prev = __atomic_exchange_n(self->uaddr, (uint32_t)value & VALUE_MASK, __ATOMIC_ACQ_REL);
+    if (!(prev & WAITERS_BIT)) {
+        return PyLong_FromLong(0);
+    }
+    // waiters may be waiting for different values: wake them all and let each re-check
+    int res = futex_wake(self->uaddr, INT_MAX);
+    if (res < 0) {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    return PyLong_FromLong(res);
+}
+
 static PyObject *FutexWord_wake(FutexWordObject *self, PyObject *args, PyObject *kwds) {
     static char *kwlist[] = {"n", NULL};
     int n = 1;
@@ -114,7 +139,7 @@ static PyObject *FutexWord_wait_for_value(FutexWordObject *self, PyObject *args,
     uint32_t desired = (uint32_t)desired_ul;
 
     uint32_t cur = __atomic_load_n(self->uaddr, __ATOMIC_ACQUIRE);
-    if (cur == desired) {
+    if ((cur & VALUE_MASK) == desired) {
         Py_RETURN_TRUE;
     }
 
@@ -122,8 +147,8 @@ static PyObject *FutexWord_wait_for_value(FutexWordObject *self, PyObject *args,
     const int SPIN_LIMIT = 200;
     for (int i = 0; i < SPIN_LIMIT; i++) {
         CPU_RELAX();
-        cur = __atomic_load_n(self->uaddr, __ATOMIC_RELAXED);
-        if (cur == desired) {
+        cur = __atomic_load_n(self->uaddr, __ATOMIC_ACQUIRE);
+        if ((cur & VALUE_MASK) == desired) {
             Py_RETURN_TRUE;
         }
     }
@@ -138,15 +163,30 @@ static PyObject *FutexWord_wait_for_value(FutexWordObject *self, PyObject *args,
 
     while (1) {
         cur = __atomic_load_n(self->uaddr, __ATOMIC_ACQUIRE);
-        if (cur == desired) {
+        if ((cur & VALUE_MASK) == desired) {
             Py_RETURN_TRUE;
         }
 
-        int err = futex_wait(self->uaddr, cur, tsp);
+        // announce ourselves before sleeping, so that the next store_and_wake wakes us
+        if (!(cur & WAITERS_BIT)) {
+            if (!__atomic_compare_exchange_n(self->uaddr, &cur, cur | WAITERS_BIT, false,
+                                             __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE)) {
+                continue;
+            }
+            cur |= WAITERS_BIT;
+        }
+
+        // Sleep without the GIL, so the process's other threads keep running meanwhile
+        int err, wait_errno;
+        Py_BEGIN_ALLOW_THREADS
+        err = futex_wait(self->uaddr, cur, tsp);
+        wait_errno = errno;
+        Py_END_ALLOW_THREADS
         if (err == 0) {
             // woken; loop to re-check
             continue;
         }
+        errno = wait_errno;
         if (errno == ETIMEDOUT) {
             Py_RETURN_FALSE;
         }
@@ -165,6 +205,8 @@ static PyObject *FutexWord_wait_for_value(FutexWordObject *self, PyObject *args,
 static PyMethodDef FutexWord_methods[] = {
     {"load", (PyCFunction)FutexWord_load, METH_NOARGS, PyDoc_STR("Load current value (acquire)")},
     {"store", (PyCFunction)FutexWord_store, METH_VARARGS, PyDoc_STR("Store value (release)")},
+    {"store_and_wake", (PyCFunction)FutexWord_store_and_wake, METH_VARARGS,
+     PyDoc_STR("Store value (release) and wake waiters only if any are blocked; returns number woken")},
     {"wake", (PyCFunction)FutexWord_wake, METH_VARARGS | METH_KEYWORDS,
      PyDoc_STR("Wake up to n waiters; returns number of threads woken")},
     {"wait_for_value", (PyCFunction)FutexWord_wait_for_value, METH_VARARGS | METH_KEYWORDS,
@@ -1,8 +1,42 @@
 from __future__ import annotations
 
+import mmap
+import os
 import types
+import weakref
 from abc import ABC, abstractmethod
-from typing import ClassVar
+from typing import Any, Callable, ClassVar, Sequence, TypeVar
+
+from shm_rpc_bridge.exceptions import RPCTransportError
+
+_T = TypeVar("_T")
+
+
+class _UnusableAfterFork:
+    """Stands in, in a forked child, for the semaphores and buffer synchronization of an
+    inherited transport, whose buffers the child does not get mapped: any use raises."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise RPCTransportError(
+            "Transport inherited across fork() cannot be used in the child; open a new one"
+        )
+
+
+_UNUSABLE_AFTER_FORK: Any = _UnusableAfterFork()
+
+
+def _byte_parts(
+    parts: Sequence[bytes | bytearray | memoryview],
+) -> Sequence[bytes | bytearray | memoryview]:
+    """parts, with any other buffer (e.g. a memoryview of an array of ints) cast to a view of
+    its bytes, so that len() counts bytes and slicing copies them."""
+    try:
+        return [
+            part if isinstance(part, (bytes, bytearray)) else memoryview(part).cast("B")
+            for part in parts
+        ]
+    except TypeError as e:
+        raise RPCTransportError(f"Cannot send message part: {e}") from e
 
 
 class SharedMemoryTransportABC(ABC):
@@ -90,6 +124,22 @@ class SharedMemoryTransportABC(ABC):
         """
         ...
 
+    def send_request_parts(self, parts: Sequence[bytes | bytearray | memoryview]) -> None:
+        """
+        Send request data given as several buffers, written back to back (client -> server).
+
+        Transports override this to copy each part straight into shared memory, sparing the
+        caller from joining them into one intermediate buffer first.
+
+        Args:
+            parts: Buffers making up the request, in order
+
+        Raises:
+            RPCTransportError: If send fails
+            RPCTimeoutError: If operation times out
+        """
+        self.send_request(b"".join(parts))
+
     @abstractmethod
     def receive_request(self) -> bytes:
         """
@@ -104,6 +154,23 @@ class SharedMemoryTransportABC(ABC):
         """
         ...
 
+    def receive_request_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
+        """
+        Receive request data and hand it to decode, returning what decode returns (server side).
+
+        Transports override this to pass decode a view of the data still in shared memory,
+        sparing the copy receive_request makes: the buffer is only handed back to the writer
+        once decode returns, so decode must not keep the view (or anything sharing its memory).
+
+        Args:
+            decode: Consumes the received data
+
+        Raises:
+            RPCTransportError: If receive fails
+            RPCTimeoutError: If operation times out
+        """
+        return decode(self.receive_request())
+
     @abstractmethod
     def send_response(self, data: bytes) -> None:
         """
@@ -132,6 +199,21 @@ class SharedMemoryTransportABC(ABC):
         """
         ...
 
+    def receive_response_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
+        """
+        Receive response data and hand it to decode, returning what decode returns (client side).
+
+        See receive_request_with.
+
+        Args:
+            decode: Consumes the received data
+
+        Raises:
+            RPCTransportError: If receive fails
+            RPCTimeoutError: If operation times out
+        """
+        return decode(self.receive_response())
+
     # ------------------------------------------------------------------
     # Context Management
     # ------------------------------------------------------------------
@@ -151,11 +233,47 @@ class SharedMemoryTransportABC(ABC):
     # Cleanup and Other Utilities
     # ------------------------------------------------------------------
     _TRANSPORT_PREFIX: ClassVar[str] = "srb"
+    # Flags for mapping the buffers. MAP_POPULATE (Linux) faults every page in when mapping,
+    # so that the first messages do not pay a page fault per page touched
+    _MAP_FLAGS: ClassVar[int] = mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0)
+
+    @classmethod
+    def _map_buffer(cls, fd: int, size: int) -> mmap.mmap:
+        """Map the first size bytes of shared memory object fd, for reading and writing."""
+        buffer = mmap.mmap(fd, size, cls._MAP_FLAGS, mmap.PROT_READ | mmap.PROT_WRITE)
+        # Keep the mapping out of forked children (Linux): a child writing through an inherited
+        # transport would corrupt the exchange between the two ends it was copied from
+        if hasattr(mmap, "MADV_DONTFORK"):
+            buffer.madvise(mmap.MADV_DONTFORK)
+        return buffer
+
+    # Transports alive in this process, disowned in forked children (see _disown_after_fork)
+    _live_transports: ClassVar[weakref.WeakSet[SharedMemoryTransportABC]] = weakref.WeakSet()
+
+    def _track_across_fork(self) -> None:
+        """Have this transport disowned in any child this process forks from now on."""
+        SharedMemoryTransportABC._live_transports.add(self)
+
+    @abstractmethod
+    def _disown_after_fork(self) -> None:
+        """
+        Run in a forked child on each transport inherited from the parent. The child does not
+        get the buffers mapped (MADV_DONTFORK), so send/receive must raise RPCTransportError
+        rather than touch them, and close() must release the child's handles without unlinking
+        the IPC objects the parent still uses.
+        """
+        ...
+
+    @staticmethod
+    def _disown_all_after_fork() -> None:
+        for transport in list(SharedMemoryTransportABC._live_transports):
+            transport._disown_after_fork()
 
     @staticmethod
     @abstractmethod
-    def delete_resources() -> None:
-        """Best-effort removal of leftover IPC objects."""
+    def delete_resources(name: str | None = None) -> None:
+        """Best-effort removal of leftover IPC objects: those of the transport called name, or,
+        without a name, of any transport."""
         ...
 
     @staticmethod
@@ -182,3 +300,6 @@ class SharedMemoryTransportABC(ABC):
             f"/{SharedMemoryTransportABC._TRANSPORT_PREFIX}_{name}_req",
             f"/{SharedMemoryTransportABC._TRANSPORT_PREFIX}_{name}_resp",
         )
+
+
+os.register_at_fork(after_in_child=SharedMemoryTransportABC._disown_all_after_fork)
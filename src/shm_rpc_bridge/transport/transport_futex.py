@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import errno
 import logging
 import mmap
@@ -8,14 +9,16 @@ import struct
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Sequence, TypeVar
 
 import posix_ipc
 
-from shm_rpc_bridge.exceptions import RPCTimeoutError, RPCTransportError
+from shm_rpc_bridge.exceptions import RPCError, RPCTimeoutError, RPCTransportError
 
 from .linux_futex import FutexWord  # type: ignore[import]
-from .transport import SharedMemoryTransportABC
+from .transport import _UNUSABLE_AFTER_FORK, SharedMemoryTransportABC, _byte_parts
+
+_T = TypeVar("_T")
 
 
 class SharedMemoryTransportFutex(SharedMemoryTransportABC):
@@ -86,8 +89,8 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         # Lock to synchronize cleanup with send/receive operations
         self._lock = threading.RLock()
 
-        self.request_shm_name = f"/shm_rpc_bridge_{name}_req"
-        self.response_shm_name = f"/shm_rpc_bridge_{name}_resp"
+        # Names for POSIX shared memory segments (need / prefix)
+        self.request_shm_name, self.response_shm_name = self.get_shared_mem_names(name)
 
         self.request_shm: posix_ipc.SharedMemory | None = None
         self.response_shm: posix_ipc.SharedMemory | None = None
@@ -99,6 +102,7 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         self._response_sync: _BufferSync | None = None
 
         self._initialize()
+        self._track_across_fork()
 
     def _initialize(self) -> None:
         logging.info("Starting {}", self.__class__.__name__)
@@ -129,27 +133,17 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         )
 
         # Create mmap objects for zero-copy memory access
-        self.request_mmap = mmap.mmap(
-            self.request_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
-        self.response_mmap = mmap.mmap(
-            self.response_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
+        self.request_mmap = self._map_buffer(self.request_shm.fd, self.buffer_size)
+        self.response_mmap = self._map_buffer(self.response_shm.fd, self.buffer_size)
 
         # Close file descriptors early - mmap keeps the mapping valid
         self.request_shm.close_fd()
         self.response_shm.close_fd()
 
+        # No state to initialize: a new shared memory object is zero-filled, and zero is EMPTY.
+        # Writing it here would race with a client that opened the buffers and sent already.
         self._request_sync = _BufferSync(self.request_mmap, self.buffer_size)
         self._response_sync = _BufferSync(self.response_mmap, self.buffer_size)
-        self._request_sync.init_empty()
-        self._response_sync.init_empty()
 
     def _open_resources(self) -> None:
         # Open existing POSIX shared memory segments
@@ -163,18 +157,8 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         )
 
         # Create mmap objects for zero-copy memory access
-        self.request_mmap = mmap.mmap(
-            self.request_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
-        self.response_mmap = mmap.mmap(
-            self.response_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
+        self.request_mmap = self._map_buffer(self.request_shm.fd, self.buffer_size)
+        self.response_mmap = self._map_buffer(self.response_shm.fd, self.buffer_size)
 
         # Close file descriptors early - mmap keeps the mapping valid
         self.request_shm.close_fd()
@@ -183,22 +167,45 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         self._request_sync = _BufferSync(self.request_mmap, self.buffer_size)
         self._response_sync = _BufferSync(self.response_mmap, self.buffer_size)
 
+    def _disown_after_fork(self) -> None:
+        # A thread of the parent may have held the lock when it forked
+        self._lock = threading.RLock()
+        self.owner = False
+        # Dropping the syncs releases their views, so the (already unmapped) buffers can be
+        # dropped now, before anything else gets mapped there
+        self._request_sync = self._response_sync = _UNUSABLE_AFTER_FORK
+        # (one still exported, as a thread of the parent was decoding in place, is left to close())
+        with contextlib.suppress(BufferError):
+            if self.request_mmap:
+                self.request_mmap.close()
+                self.request_mmap = None
+        with contextlib.suppress(BufferError):
+            if self.response_mmap:
+                self.response_mmap.close()
+                self.response_mmap = None
+
     def send_request(self, data: bytes) -> None:
+        self.send_request_parts((data,))
+
+    def send_request_parts(self, parts: Sequence[bytes | bytearray | memoryview]) -> None:
         with self._lock:
             try:
                 assert self._request_sync is not None
-                self._request_sync.send(data, timeout=self.timeout)
+                self._request_sync.send(_byte_parts(parts), timeout=self.timeout)
             except RPCTimeoutError:
                 raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to send request: {e}") from e
 
     def receive_request(self) -> bytes:
+        return self.receive_request_with(bytes)
+
+    def receive_request_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
         with self._lock:
             try:
                 assert self._request_sync is not None
-                return self._request_sync.recv(timeout=self.timeout)
-            except RPCTimeoutError:
+                return self._request_sync.recv_with(decode, timeout=self.timeout)
+            except RPCError:
                 raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to receive request: {e}") from e
@@ -207,18 +214,21 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
         with self._lock:
             try:
                 assert self._response_sync is not None
-                self._response_sync.send(data, timeout=self.timeout)
+                self._response_sync.send((data,), timeout=self.timeout)
             except RPCTimeoutError:
                 raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to send response: {e}") from e
 
     def receive_response(self) -> bytes:
+        return self.receive_response_with(bytes)
+
+    def receive_response_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
         with self._lock:
             try:
                 assert self._response_sync is not None
-                return self._response_sync.recv(timeout=self.timeout)
-            except RPCTimeoutError:
+                return self._response_sync.recv_with(decode, timeout=self.timeout)
+            except RPCError:
                 raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to receive response: {e}") from e
@@ -257,10 +267,19 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
             self._response_sync = None
 
     @staticmethod
-    def delete_resources() -> None:
+    def delete_resources(name: str | None = None) -> None:
         """
-        Removes shared memory files on Linux
+        Removes the shared memory segments of transport name, or, without a name, shared
+        memory files of any transport on Linux
         """
+        if name is not None:
+            for shm_name in SharedMemoryTransportABC.get_shared_mem_names(name):
+                try:
+                    posix_ipc.unlink_shared_memory(shm_name)
+                except posix_ipc.Error:
+                    pass
+            return
+
         shm_prefix = SharedMemoryTransportABC._TRANSPORT_PREFIX
         # primary target on Linux
         shm_dir = "/dev/shm"
@@ -272,7 +291,7 @@ class SharedMemoryTransportFutex(SharedMemoryTransportABC):
                 path = os.path.join(shm_dir, filename)
                 try:
                     os.unlink(path)
-                except Exception:
+                except OSError:
                     pass
 
     @staticmethod
@@ -311,7 +330,7 @@ class _BufferSync:
 
     Layout in the mmap'd region:
 
-        0..4   : state word (int32) for futex (0 = EMPTY, 1 = FULL)
+        0..4   : state word (int32) for futex (0 = EMPTY, 1 = FULL; top bit flags waiters)
         4..8   : length (uint32, big-endian)
         8..N   : payload bytes
     """
@@ -322,35 +341,36 @@ class _BufferSync:
     STATE_OFFSET: int = 0
     LEN_OFFSET: int = 4
     HEADER_SIZE: int = 8
+    # Payload length, compiled once
+    _LENGTH: ClassVar[struct.Struct] = struct.Struct(">I")
 
-    EMPTY: int = 0
+    EMPTY: int = 0  # what a new (zero-filled) shared memory object starts as
     FULL: int = 1
 
     def __post_init__(self) -> None:
         if self.buf_size < self.HEADER_SIZE:
             raise ValueError("buffer_size too small")
+        self._max_payload = self.buf_size - self.HEADER_SIZE
         state_view = memoryview(self.mmap_obj)[self.STATE_OFFSET : self.STATE_OFFSET + 4]
         self._state = FutexWord(state_view)
 
-    def init_empty(self) -> None:
-        """Explicitly set state to EMPTY (call only on creator side)."""
-        self._state.store(self.EMPTY)
-
-    def _write_payload(self, data: bytes) -> None:
-        max_payload = self.buf_size - self.HEADER_SIZE
-        if len(data) > max_payload:
-            raise RPCTransportError(f"Message too large for buffer: {len(data)} > {max_payload}")
-        struct.pack_into(">I", self.mmap_obj, self.LEN_OFFSET, len(data))
-        self.mmap_obj[self.HEADER_SIZE : self.HEADER_SIZE + len(data)] = data
-
-    def _read_payload(self) -> bytes:
-        (length,) = struct.unpack_from(">I", self.mmap_obj, self.LEN_OFFSET)
-        max_payload = self.buf_size - self.HEADER_SIZE
-        if length > max_payload:
-            raise RPCTransportError(f"Corrupted message length: {length} > {max_payload}")
-        return bytes(self.mmap_obj[self.HEADER_SIZE : self.HEADER_SIZE + length])
-
-    def send(self, data: bytes, timeout: float | None) -> None:
+    def _write_payload(self, parts: Sequence[bytes | bytearray | memoryview]) -> None:
+        size = sum(len(part) for part in parts)
+        if size > self._max_payload:
+            raise RPCTransportError(f"Message too large for buffer: {size} > {self._max_payload}")
+        self._LENGTH.pack_into(self.mmap_obj, self.LEN_OFFSET, size)
+        offset = self.HEADER_SIZE
+        for part in parts:
+            self.mmap_obj[offset : offset + len(part)] = part
+            offset += len(part)
+
+    def _read_payload(self) -> memoryview:
+        (length,) = self._LENGTH.unpack_from(self.mmap_obj, self.LEN_OFFSET)
+        if length > self._max_payload:
+            raise RPCTransportError(f"Corrupted message length: {length} > {self._max_payload}")
+        return memoryview(self.mmap_obj)[self.HEADER_SIZE : self.HEADER_SIZE + length]
+
+    def send(self, parts: Sequence[bytes | bytearray | memoryview], timeout: float | None) -> None:
         """
         Writer: block in C until state == EMPTY, write, set FULL, wake reader.
         No Python-level busy wait.
@@ -360,14 +380,14 @@ class _BufferSync:
         if not self._state.wait_for_value(self.EMPTY, timeout_ns=timeout_ns):
             raise RPCTimeoutError("Timeout waiting for buffer to become EMPTY")
 
-        self._write_payload(data)
-        self._state.store(self.FULL)
-        self._state.wake(1)
+        self._write_payload(parts)
+        # only enters the kernel if the reader is already blocked in FUTEX_WAIT
+        self._state.store_and_wake(self.FULL)
 
-    def recv(self, timeout: float | None) -> bytes:
+    def recv_with(self, decode: Callable[[bytes | memoryview], _T], timeout: float | None) -> _T:
         """
-        Reader: block in C until state == FULL, read, set EMPTY, wake writer.
-        No Python-level busy wait.
+        Reader: block in C until state == FULL, decode the payload in place, set EMPTY, wake
+        writer. No Python-level busy wait.
         """
         timeout_ns = -1 if timeout is None else int(timeout * 1e9)
 
@@ -375,6 +395,8 @@ class _BufferSync:
             raise RPCTimeoutError("Timeout waiting for buffer to become FULL")
 
         data = self._read_payload()
-        self._state.store(self.EMPTY)
-        self._state.wake(1)
-        return data
+        try:
+            return decode(data)
+        finally:
+            data.release()
+            self._state.store_and_wake(self.EMPTY)
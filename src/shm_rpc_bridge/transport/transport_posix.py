@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import contextlib
+import ctypes
 import logging
 import mmap
 import os
@@ -7,16 +9,43 @@ import struct
 import sys
 import threading
 import time
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Sequence, TypeVar
 
 import posix_ipc
 
 from shm_rpc_bridge.exceptions import RPCTimeoutError, RPCTransportError
 
-from .transport import SharedMemoryTransportABC
+from .transport import _UNUSABLE_AFTER_FORK, SharedMemoryTransportABC, _byte_parts
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+def _load_darwin_libc() -> ctypes.CDLL | None:
+    """libc, for the POSIX unlink calls delete_resources falls back to on macOS (loaded once,
+    with the prototypes declared)."""
+    if sys.platform != "darwin":
+        return None
+    try:
+        libc = ctypes.CDLL("libc.dylib")
+    except OSError:
+        return None
+    for func in (libc.sem_unlink, libc.shm_unlink):
+        func.argtypes = [ctypes.c_char_p]
+        func.restype = ctypes.c_int
+    return libc
+
+
+_DARWIN_LIBC = _load_darwin_libc()
+
+
+def _usable_cpus() -> int:
+    """The number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 
 class SharedMemoryTransportPosix(SharedMemoryTransportABC):
     """
@@ -36,8 +65,16 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
     """
 
     HEADER_SIZE: ClassVar[int] = 4  # 4 bytes for message length
+    # Message length header, compiled once (explicit little-endian, no alignment padding)
+    _HEADER: ClassVar[struct.Struct] = struct.Struct("<I")
     DEFAULT_BUFFER_SIZE: ClassVar[int] = 4096  # 4KB default buffer
     DEFAULT_TIMEOUT: ClassVar[float] = 5.0  # 5 seconds
+    # Polls of a semaphore's value before blocking on it (Linux): a peer that answers within a
+    # few microseconds is picked up without going to sleep in the kernel, and, with nobody
+    # asleep on the semaphore, its release needs no wake-up call either. Harmful with a single
+    # CPU, where the peer cannot run while this process spins: off there (set to 0 to turn it
+    # off elsewhere too).
+    SPIN_TRIES: ClassVar[int] = 128 if _usable_cpus() > 1 else 0
 
     @staticmethod
     def create(
@@ -112,11 +149,15 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
 
         self.name = name
         self.buffer_size = buffer_size
+        # Largest message that fits in a buffer, after the size header
+        self._max_message_size = buffer_size - self.HEADER_SIZE
         self.timeout = timeout
         # Avoid shadowing the class staticmethod `create`
         self.owner = create
 
-        # Lock to synchronize cleanup with send/receive operations
+        # Lock to synchronize cleanup with send/receive operations: close() must not unmap the
+        # buffers or close a semaphore another thread is waiting on. Reentrant, so a signal
+        # handler running close() on a thread blocked in receive does not deadlock.
         self._lock = threading.RLock()
 
         # Names for POSIX shared memory segments (need / prefix)
@@ -134,13 +175,24 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
         self.response_shm: posix_ipc.SharedMemory | None = None
         self.request_mmap: mmap.mmap | None = None
         self.response_mmap: mmap.mmap | None = None
+        # Views over the mmaps: the header and payload are packed and sliced in place
+        self._request_view = memoryview(b"")
+        self._response_view = memoryview(b"")
 
         self.request_empty_sem: posix_ipc.Semaphore | None = None
         self.request_full_sem: posix_ipc.Semaphore | None = None
         self.response_empty_sem: posix_ipc.Semaphore | None = None
         self.response_full_sem: posix_ipc.Semaphore | None = None
+        # The semaphores again, as used by send/receive: bound once the resources exist, so
+        # that the hot paths need no None checks. close() leaves them (and the views) pointing
+        # at the closed objects, which raise if used.
+        self._request_empty_sem: posix_ipc.Semaphore
+        self._request_full_sem: posix_ipc.Semaphore
+        self._response_empty_sem: posix_ipc.Semaphore
+        self._response_full_sem: posix_ipc.Semaphore
 
         self._initialize()
+        self._track_across_fork()
 
     def _initialize(self) -> None:
         try:
@@ -173,18 +225,8 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
         )
 
         # Create mmap objects for zero-copy memory access
-        self.request_mmap = mmap.mmap(
-            self.request_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
-        self.response_mmap = mmap.mmap(
-            self.response_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
+        self.request_mmap = self._map_buffer(self.request_shm.fd, self.buffer_size)
+        self.response_mmap = self._map_buffer(self.response_shm.fd, self.buffer_size)
 
         # Close file descriptors early - mmap keeps the mapping valid
         self.request_shm.close_fd()
@@ -211,6 +253,7 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
             flags=posix_ipc.O_CREX,
             initial_value=0,
         )
+        self._bind_resources()
         logger.info("All POSIX resources for channel %s successfully created.", self.name)
 
     def _open_resources(self) -> None:
@@ -247,18 +290,8 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
             )
 
         # Create mmap objects for zero-copy memory access
-        self.request_mmap = mmap.mmap(
-            self.request_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
-        self.response_mmap = mmap.mmap(
-            self.response_shm.fd,
-            self.buffer_size,
-            mmap.MAP_SHARED,
-            mmap.PROT_READ | mmap.PROT_WRITE,
-        )
+        self.request_mmap = self._map_buffer(self.request_shm.fd, self.buffer_size)
+        self.response_mmap = self._map_buffer(self.response_shm.fd, self.buffer_size)
 
         # Close file descriptors early - mmap keeps the mapping valid
         self.request_shm.close_fd()
@@ -270,56 +303,91 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
         self.response_empty_sem = posix_ipc.Semaphore(self.response_empty_sem_name)
         self.response_full_sem = posix_ipc.Semaphore(self.response_full_sem_name)
 
+        self._bind_resources()
         logger.info("All POSIX resources for channel %s successfully opened.", self.name)
 
+    def _bind_resources(self) -> None:
+        assert self.request_mmap is not None
+        assert self.response_mmap is not None
+        self._request_view = memoryview(self.request_mmap)
+        self._response_view = memoryview(self.response_mmap)
+        self._request_empty_sem = self.request_empty_sem
+        self._request_full_sem = self.request_full_sem
+        self._response_empty_sem = self.response_empty_sem
+        self._response_full_sem = self.response_full_sem
+
+    def _disown_after_fork(self) -> None:
+        # A thread of the parent may have held the lock when it forked
+        self._lock = threading.RLock()
+        self.owner = False
+        self._request_empty_sem = self._request_full_sem = _UNUSABLE_AFTER_FORK
+        self._response_empty_sem = self._response_full_sem = _UNUSABLE_AFTER_FORK
+        # Drop the (already unmapped) buffers now, before anything else gets mapped there
+        self._request_view.release()
+        self._response_view.release()
+        # (one still exported, as a thread of the parent was decoding in place, is left to close())
+        with contextlib.suppress(BufferError):
+            if self.request_mmap:
+                self.request_mmap.close()
+                self.request_mmap = None
+        with contextlib.suppress(BufferError):
+            if self.response_mmap:
+                self.response_mmap.close()
+                self.response_mmap = None
+
     def __del__(self) -> None:
         self.close()
 
     def send_request(self, data: bytes) -> None:
-        logger.debug("Sending request on channel %s.", self.name)
+        self.send_request_parts((data,))
 
-        if len(data) > self.buffer_size - self.HEADER_SIZE:
-            raise RPCTransportError(f"Message too large: {len(data)} bytes exceeds buffer size")
+    def send_request_parts(self, parts: Sequence[bytes | bytearray | memoryview]) -> None:
+        logger.debug("Sending request on channel %s.", self.name)
 
-        logger.debug("send_request -> waiting for lock in channel %s...", self.name)
+        parts = _byte_parts(parts)
+        size = sum(len(part) for part in parts)
+        if size > self._max_message_size:
+            raise RPCTransportError(f"Message too large: {size} bytes exceeds buffer size")
 
         with self._lock:
-            logger.debug("send_request -> acquired lock in channel %s...", self.name)
-
             try:
                 # Wait for empty slot
-                assert self.request_empty_sem is not None
-                assert self.request_full_sem is not None
-
                 logger.debug(
                     "send_request -> acquiring semaphore %s...",
                     self.request_empty_sem_name,
                 )
 
-                self.portable_acquire(self.request_empty_sem, self.timeout)
+                self.portable_acquire(self._request_empty_sem, self.timeout)
 
                 logger.debug(
                     "send_request -> semaphore %s acquired. ready to send request!",
                     self.request_empty_sem_name,
                 )
 
-                # Zero-copy write using mmap
-                assert self.request_mmap is not None
-                size = len(data)
-                # Write size header (4 bytes)
-                self.request_mmap.seek(0)
-                self.request_mmap.write(struct.pack("I", size))
-                # Zero-copy write of data
-                self.request_mmap.write(data)
+                try:
+                    # Zero-copy write using mmap
+                    view = self._request_view
+                    # Write size header (4 bytes)
+                    self._HEADER.pack_into(view, 0, size)
+                    # Write the parts back to back, straight into shared memory
+                    offset = self.HEADER_SIZE
+                    for part in parts:
+                        end = offset + len(part)
+                        view[offset:end] = part
+                        offset = end
+                except BaseException:
+                    # Hand the slot back, or no later send on the channel could get it
+                    self._request_empty_sem.release()
+                    raise
 
                 logger.debug(
                     "send_request -> request written (%d bytes). releasing semaphore %s...",
-                    len(data),
+                    size,
                     self.request_full_sem_name,
                 )
 
                 # Signal full slot
-                self.request_full_sem.release()
+                self._request_full_sem.release()
 
                 logger.debug(
                     "send_request -> released semaphore %s.",
@@ -328,29 +396,24 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
 
             except posix_ipc.BusyError as e:
                 raise RPCTimeoutError("Timeout sending request") from e
+            except RPCTransportError:
+                raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to send request: {e}") from e
 
-            finally:
-                logger.debug("send_request -> releasing lock in channel %s...", self.name)
-
     def receive_request(self) -> bytes:
-        logger.debug("receive_request -> waiting for lock in channel %s...", self.name)
+        return self.receive_request_with(bytes)
 
+    def receive_request_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
         with self._lock:
-            logger.debug("receive_request -> acquired lock in channel %s...", self.name)
-
             try:
                 # Wait for full slot
-                assert self.request_full_sem is not None
-                assert self.request_empty_sem is not None
-
                 logger.debug(
                     "receive_request -> acquiring semaphore %s...",
                     self.request_full_sem_name,
                 )
 
-                self.portable_acquire(self.request_full_sem, self.timeout)
+                self.portable_acquire(self._request_full_sem, self.timeout)
 
                 logger.debug(
                     "receive_request -> semaphore %s acquired. ready to read request!",
@@ -358,57 +421,48 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
                 )
 
                 # Zero-copy read using mmap
-                assert self.request_mmap is not None
+                view = self._request_view
                 # Read size header
-                self.request_mmap.seek(0)
-                size_bytes = self.request_mmap.read(self.HEADER_SIZE)
-                size = struct.unpack("I", size_bytes)[0]
+                size = self._HEADER.unpack_from(view, 0)[0]
                 # Validate size
-                if size < 0 or size > self.buffer_size - self.HEADER_SIZE:
+                if size > self._max_message_size:
                     raise RPCTransportError(f"Invalid message size: {size}")
-                # Read data
-                data = self.request_mmap.read(size)
-
-                # Signal empty slot
-                self.request_empty_sem.release()
-
-                logger.debug(
-                    "receive_request -> semaphore %s released. "
-                    "returning received request (%d bytes)!",
-                    self.request_empty_sem_name,
-                    len(data),
-                )
-
-                return data
+                data = view[self.HEADER_SIZE : self.HEADER_SIZE + size]
 
             except posix_ipc.BusyError as e:
                 raise RPCTimeoutError("Timeout receiving request") from e
+            except RPCTransportError:
+                raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to receive request: {e}") from e
 
+            # Decode in place: the writer gets the slot back only once decode is done with it
+            try:
+                return decode(data)
             finally:
-                logger.debug("receive_request -> releasing lock in channel %s...", self.name)
+                data.release()
+                # Signal empty slot
+                self._request_empty_sem.release()
+
+                logger.debug(
+                    "receive_request -> semaphore %s released (%d bytes request consumed)!",
+                    self.request_empty_sem_name,
+                    size,
+                )
 
     def send_response(self, data: bytes) -> None:
-        if len(data) > self.buffer_size - self.HEADER_SIZE:
+        if len(data) > self._max_message_size:
             raise RPCTransportError(f"Message too large: {len(data)} bytes exceeds buffer size")
 
-        logger.debug("send_response -> waiting for lock in channel %s...", self.name)
-
         with self._lock:
-            logger.debug("send_response -> acquired lock in channel %s...", self.name)
-
             try:
                 # Wait for empty slot
-                assert self.response_empty_sem is not None
-                assert self.response_full_sem is not None
-
                 logger.debug(
                     "send_response -> acquiring semaphore %s...",
                     self.response_empty_sem_name,
                 )
 
-                self.portable_acquire(self.response_empty_sem, self.timeout)
+                self.portable_acquire(self._response_empty_sem, self.timeout)
 
                 logger.debug(
                     "send_response -> semaphore %s acquired. ready to send response!",
@@ -416,13 +470,12 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
                 )
 
                 # Zero-copy write using mmap
-                assert self.response_mmap is not None
+                view = self._response_view
                 size = len(data)
                 # Write size header (4 bytes)
-                self.response_mmap.seek(0)
-                self.response_mmap.write(struct.pack("I", size))
+                self._HEADER.pack_into(view, 0, size)
                 # Zero-copy write of data
-                self.response_mmap.write(data)
+                view[self.HEADER_SIZE : self.HEADER_SIZE + size] = data
 
                 logger.debug(
                     "send_response -> response written (%d bytes). releasing semaphore %s...",
@@ -431,7 +484,7 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
                 )
 
                 # Signal full slot
-                self.response_full_sem.release()
+                self._response_full_sem.release()
 
                 logger.debug(
                     "send_response -> released semaphore %s.",
@@ -440,29 +493,24 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
 
             except posix_ipc.BusyError as e:
                 raise RPCTimeoutError("Timeout sending response") from e
+            except RPCTransportError:
+                raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to send response: {e}") from e
 
-            finally:
-                logger.debug("send_response -> releasing lock in channel %s...", self.name)
-
     def receive_response(self) -> bytes:
-        logger.debug("receive_response -> waiting for lock in channel %s...", self.name)
+        return self.receive_response_with(bytes)
 
+    def receive_response_with(self, decode: Callable[[bytes | memoryview], _T]) -> _T:
         with self._lock:
-            logger.debug("receive_response -> acquired lock in channel %s...", self.name)
-
             try:
                 # Wait for full slot
-                assert self.response_full_sem is not None
-                assert self.response_empty_sem is not None
-
                 logger.debug(
                     "receive_response -> acquiring semaphore %s...",
                     self.response_full_sem_name,
                 )
 
-                self.portable_acquire(self.response_full_sem, self.timeout)
+                self.portable_acquire(self._response_full_sem, self.timeout)
 
                 logger.debug(
                     "receive_response -> semaphore %s acquired. ready to read response!",
@@ -470,36 +518,34 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
                 )
 
                 # Zero-copy read using mmap
-                assert self.response_mmap is not None
+                view = self._response_view
                 # Read size header
-                self.response_mmap.seek(0)
-                size_bytes = self.response_mmap.read(self.HEADER_SIZE)
-                size = struct.unpack("I", size_bytes)[0]
+                size = self._HEADER.unpack_from(view, 0)[0]
                 # Validate size
-                if size < 0 or size > self.buffer_size - self.HEADER_SIZE:
+                if size > self._max_message_size:
                     raise RPCTransportError(f"Invalid message size: {size}")
-                # Read data
-                data = self.response_mmap.read(size)
-
-                # Signal empty slot
-                self.response_empty_sem.release()
-
-                logger.debug(
-                    "receive_response -> semaphore %s released. "
-                    "returning received response (%d bytes)!",
-                    self.response_empty_sem_name,
-                    len(data),
-                )
-
-                return data
+                data = view[self.HEADER_SIZE : self.HEADER_SIZE + size]
 
             except posix_ipc.BusyError as e:
                 raise RPCTimeoutError("Timeout receiving response") from e
+            except RPCTransportError:
+                raise
             except Exception as e:
                 raise RPCTransportError(f"Failed to receive response: {e}") from e
 
+            # Decode in place: the writer gets the slot back only once decode is done with it
+            try:
+                return decode(data)
             finally:
-                logger.debug("receive_response -> releasing lock in channel %s...", self.name)
+                data.release()
+                # Signal empty slot
+                self._response_empty_sem.release()
+
+                logger.debug(
+                    "receive_response -> semaphore %s released (%d bytes response consumed)!",
+                    self.response_empty_sem_name,
+                    size,
+                )
 
     def close(self) -> None:
         logger.debug("close -> waiting for lock in channel %s...", self.name)
@@ -532,6 +578,10 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
             try:
                 logger.info("close -> unlinking resources in channel %s...", self.name)
 
+                # Release the views first: an mmap with exported buffers cannot be closed
+                self._request_view.release()
+                self._response_view.release()
+
                 # Close mmap objects
                 cleanup_mmap(self.request_mmap)
                 self.request_mmap = None
@@ -563,10 +613,19 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
     # Portability Linux / MacOS
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def portable_acquire(sem: posix_ipc.Semaphore, timeout: float) -> None:
+    @classmethod
+    def portable_acquire(cls, sem: posix_ipc.Semaphore, timeout: float) -> None:
         # Fast path for Linux and other sane platforms
         if sys.platform != "darwin":
+            for _ in range(cls.SPIN_TRIES):
+                # sem_getvalue: a plain read, ten times cheaper than a sem_trywait that fails
+                # (and raises); only try to take the semaphore once it is up
+                if sem.value > 0:
+                    try:
+                        sem.acquire(0)
+                        return
+                    except posix_ipc.BusyError:
+                        pass  # taken by another waiter in between
             # BusyError is raised by when timeout expires
             sem.acquire(timeout)  # native timed wait, very efficient
             return
@@ -589,13 +648,26 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
     # Cleanup and others
     # ------------------------------------------------------------------
     @staticmethod
-    def delete_resources() -> None:
+    def delete_resources(name: str | None = None) -> None:
         """
-        Removes candidate shared memory and semaphore files on Linux and attempts
-        POSIX unlink via libc on macOS; failures are ignored.
+        Given a transport name, unlinks its shared memory segments and semaphores by their
+        exact names. Otherwise, removes candidate shared memory and semaphore files on Linux
+        and attempts POSIX unlink via libc on macOS. Failures are ignored.
         """
-        import ctypes
-        import platform
+        if name is not None:
+            for shm_name in SharedMemoryTransportABC.get_shared_mem_names(name):
+                try:
+                    posix_ipc.unlink_shared_memory(shm_name)
+                except posix_ipc.Error:
+                    pass
+            for sem_name in SharedMemoryTransportPosix._get_request_semaphore_names(
+                name
+            ) + SharedMemoryTransportPosix._get_response_semaphore_names(name):
+                try:
+                    posix_ipc.unlink_semaphore(sem_name)
+                except posix_ipc.Error:
+                    pass
+            return
 
         shm_prefix = SharedMemoryTransportABC._TRANSPORT_PREFIX
         sem_prefix = f"sem.{shm_prefix}"
@@ -604,26 +676,22 @@ class SharedMemoryTransportPosix(SharedMemoryTransportABC):
         # additional dirs to probe (macOS often doesn't expose /dev/shm)
         probe_dirs = [shm_dir, "/var/run", "/private/var/run", "/var/tmp", "/tmp"]
 
-        is_darwin = platform.system() == "Darwin"
-        libc = None
-        if is_darwin:
-            try:
-                libc = ctypes.CDLL("libc.dylib")
-            except Exception:
-                libc = None
+        libc = _DARWIN_LIBC
 
         for d in probe_dirs:
-            if not os.path.exists(d):
+            try:
+                filenames = os.listdir(d)
+            except OSError:  # missing or unreadable
                 continue
-            for filename in os.listdir(d):
+            for filename in filenames:
                 if filename.startswith(shm_prefix) or filename.startswith(sem_prefix):
                     path = os.path.join(d, filename)
                     try:
                         os.unlink(path)
-                    except Exception:
+                    except OSError:
                         pass
                     # on macOS try POSIX unlink for named objects as a fallback
-                    if is_darwin and libc is not None:
+                    if libc is not None:
                         try:
                             # try both with and without leading slash
                             candidate_names = [filename]
@@ -175,3 +175,24 @@ class TestRPCCodec:
         assert decoded.request_id == response.request_id
         assert decoded.result == response.result
         assert decoded.error is None
+
+    def test_encode_request_as_array(self) -> None:
+        """Test that a request goes on the wire as an array of its fields."""
+        codec = RPCCodec()
+        request = RPCRequest(request_id="test-123", method="add", params=[1, 2])
+        assert codec.encode_request(request) == b'["test-123","add",[1,2]]'
+
+    def test_encode_call(self) -> None:
+        """Test that a request encoded from its fields matches the encoded RPCRequest."""
+        codec = RPCCodec()
+        request = RPCRequest(request_id="test-123", method="add", params={"a": 1, "b": 2})
+        encoded = codec.encode_call("test-123", "add", {"a": 1, "b": 2})
+        assert encoded == codec.encode_request(request)
+        assert codec.decode_request(encoded) == request
+
+    def test_encode_request_raw(self) -> None:
+        """Test that a request with pre-encoded params decodes like any other."""
+        codec = RPCCodec()
+        encoded = b"".join(codec.encode_request_raw("test-123", "add", b'{"a":1,"b":2}'))
+        decoded = codec.decode_request(encoded)
+        assert decoded == RPCRequest(request_id="test-123", method="add", params={"a": 1, "b": 2})
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import multiprocessing
+import time
 
+import orjson
 import pytest
 
 from shm_rpc_bridge.client import RPCClient
-from shm_rpc_bridge.exceptions import RPCMethodError
+from shm_rpc_bridge.exceptions import RPCError, RPCMethodError, RPCTimeoutError
 from shm_rpc_bridge.server import RPCServer
 from shm_rpc_bridge.transport.transport_chooser import SharedMemoryTransport
 
@@ -94,6 +96,144 @@ class TestClientServerIntegration:
         finally:
             server_process.terminate()
 
+    def test_rpc_call_with_positional_params(self) -> None:
+        channel = "t_pos"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                assert client.call_positional("divide", 10, 4) == 2.5
+                assert client.call_positional("greet", "Alice") == "Hello, Alice!"
+        finally:
+            server_process.terminate()
+
+    def test_rpc_call_with_bound_method(self) -> None:
+        channel = "t_bind"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                divide = client.bind("divide")
+                greet = client.bind("greet")
+                assert divide != greet
+                assert client.bind("divide") == divide
+                assert client.call_positional(divide, 10, 4) == 2.5
+                assert client.call_positional(greet, "Alice") == "Hello, Alice!"
+                with pytest.raises(RPCMethodError, match="Unknown method"):
+                    client.bind("nope")
+                with pytest.raises(RPCMethodError, match="Unknown method"):
+                    client.call_positional(999, 1)
+        finally:
+            server_process.terminate()
+
+    def test_batched_rpc_calls(self) -> None:
+        channel = "t_bc"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                results = client.call_batch(
+                    [("add", {"a": 1, "b": 2}), ("greet", {"name": "Alice"})]
+                )
+                assert results == [3, "Hello, Alice!"]
+                assert client.call_batch([]) == []
+
+                with pytest.raises(RPCMethodError, match="Division by zero"):
+                    client.call_batch([("add", {"a": 1, "b": 2}), ("divide", {"a": 1, "b": 0})])
+        finally:
+            server_process.terminate()
+
+    def test_pipelined_rpc_calls(self) -> None:
+        channel = "t_pc"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                for i in range(RPCClient.MAX_IN_FLIGHT):
+                    client.submit("add", a=i, b=1)
+                with pytest.raises(RPCError, match="in flight"):
+                    client.submit("add", a=0, b=0)
+                with pytest.raises(RPCError, match="not reaped"):
+                    client.call("add", a=0, b=0)
+
+                assert [client.reap() for _ in range(RPCClient.MAX_IN_FLIGHT)] == [1, 2, 3]
+                with pytest.raises(RPCError, match="No calls in flight"):
+                    client.reap()
+                assert client.call("add", a=1, b=1) == 2
+        finally:
+            server_process.terminate()
+
+    def test_pipelined_rpc_calls_reaped_late(self) -> None:
+        """Results reaped after the server's timeout are dropped, but the server keeps serving."""
+        channel = "t_pcl"
+
+        server_process = multiprocessing.Process(
+            target=self._run_test_server, args=(channel,), kwargs={"timeout": 0.5}
+        )
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=1.0, wait_for_server=5.0) as client:
+                for i in range(RPCClient.MAX_IN_FLIGHT):
+                    client.submit("add", a=i, b=1)
+                # longer than the server waits to hand over each of the last two results
+                time.sleep(2.0)
+
+                assert client.reap() == 1
+                for _ in range(RPCClient.MAX_IN_FLIGHT - 1):
+                    with pytest.raises(RPCTimeoutError):
+                        client.reap()
+                assert server_process.is_alive()
+                assert client.call("add", a=1, b=1) == 2
+        finally:
+            server_process.terminate()
+
+    def test_rpc_call_many(self) -> None:
+        channel = "t_cm"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                assert client.call_many("add", ({"a": i, "b": 1} for i in range(10))) == list(
+                    range(1, 11)
+                )
+                assert client.call_many("add", []) == []
+
+                with pytest.raises(RPCMethodError, match="Division by zero"):
+                    client.call_many("divide", [{"a": 1, "b": 1}, {"a": 1, "b": 0}] * 3)
+                # the calls still in flight when the error came back have been collected
+                assert client.call("add", a=1, b=1) == 2
+        finally:
+            server_process.terminate()
+
+    def test_rpc_call_with_pre_encoded_params(self) -> None:
+        channel = "t_raw"
+
+        server_process = multiprocessing.Process(target=self._run_test_server, args=(channel,))
+        server_process.start()
+
+        try:
+            with RPCClient(channel, timeout=2.0, wait_for_server=5.0) as client:
+                params = orjson.dumps({"name": "Alice"})
+                assert client.call_raw("greet", params) == "Hello, Alice!"
+                assert client.call_raw("greet", params) == "Hello, Alice!"
+                # Any bytes-like object, e.g. a view of part of a larger buffer
+                buffer = bytearray(b"xx" + params + b"yy")
+                view = memoryview(buffer)[2:-2]
+                assert client.call_raw("greet", view) == "Hello, Alice!"
+        finally:
+            server_process.terminate()
+
     def test_rpc_calls_from_diff_clients(self) -> None:
         channel = "t_dc"
 
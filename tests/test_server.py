@@ -40,12 +40,19 @@ class TestRPCServer:
         def test_func(x: int) -> int:
             return x * 2
 
-        assert len(server._methods) == 1
+        assert len(server._methods) == 3
         server.register("test", test_func)
-        assert len(server._methods) == 2
+        assert len(server._methods) == 4
         assert "test" in server._methods
         assert server._methods["test"] == test_func
 
+    def test_register_again_after_bind(self, server) -> None:
+        server.register("test", lambda x: x * 2)
+        method_id = server.__bind__("test")
+        server.register("test", lambda x: x * 3)
+        assert server.__bind__("test") == method_id
+        assert server._dispatch(method_id, [2]) == 6
+
     def test_register_decorator(self, server) -> None:
         @server.register_function
         def multiply(x: int, y: int) -> int:
@@ -53,6 +60,16 @@ class TestRPCServer:
 
         assert "multiply" in server._methods
 
+    def test_start_calls_ready_callback(self, server) -> None:
+        calls = []
+
+        def on_ready() -> None:
+            calls.append(server._running)
+            server.close()
+
+        server.start(ready_callback=on_ready)
+        assert calls == [True]
+
 
 class TestAutoCleanupBeforeStart:
     """Tests resource management before server starts"""
@@ -157,8 +174,7 @@ class TestAutoCleanupAfterStart:
     @staticmethod
     def _create_rpc_server(name: str, started: multiprocessing.Event) -> None:
         server = RPCServer(name)
-        started.set()
-        server.start()
+        server.start(ready_callback=started.set)
 
     def test_auto_cleanup_on_sigterm_after_server_start(self) -> None:
         server_name = "t_sigterm_asok"
@@ -0,0 +1,62 @@
+from array import array
+
+import pytest
+
+pytest.importorskip("shm_rpc_bridge.transport.linux_futex", reason="futex extension not built")
+
+# -------------------------------------------------------------------------------------
+# overriding two fixture definitions here to force SharedMemoryTransportFutex usage
+# -------------------------------------------------------------------------------------
+from conftest import _TEST_CHANNEL
+
+from shm_rpc_bridge.transport.transport_futex import SharedMemoryTransportFutex
+
+
+@pytest.fixture
+def server_transport(buffer_size, timeout):
+    transport = SharedMemoryTransportFutex.create(
+        name=_TEST_CHANNEL, buffer_size=buffer_size, timeout=timeout
+    )
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def client_transport(buffer_size, timeout):
+    transport = SharedMemoryTransportFutex.open(
+        name=_TEST_CHANNEL, buffer_size=buffer_size, timeout=timeout
+    )
+    yield transport
+    transport.close()
+
+
+# -------------------------------------------------------------------------------------
+
+
+class TestSharedMemoryTransportFutex:
+    def test_create_and_close(self, buffer_size) -> None:
+        transport = SharedMemoryTransportFutex.create(name="t_cre", buffer_size=buffer_size)
+        with pytest.raises(AssertionError):
+            SharedMemoryTransportFutex.assert_no_resources_left_behind(transport.name)
+        transport.close()
+        SharedMemoryTransportFutex.assert_no_resources_left_behind(transport.name)
+
+    def test_delete_resources_by_name(self, server_transport) -> None:
+        with SharedMemoryTransportFutex.create(name="t_del") as transport:
+            SharedMemoryTransportFutex.delete_resources("t_del")
+            SharedMemoryTransportFutex.assert_no_resources_left_behind(transport.name)
+        # other transports are left alone
+        with pytest.raises(AssertionError):
+            SharedMemoryTransportFutex.assert_no_resources_left_behind(server_transport.name)
+
+    def test_send_receive(self, server_transport, client_transport) -> None:
+        client_transport.send_request(b"Request data")
+        assert server_transport.receive_request() == b"Request data"
+        server_transport.send_response(b"Response data")
+        assert client_transport.receive_response() == b"Response data"
+
+    def test_send_view_of_wider_items(self, server_transport, client_transport) -> None:
+        """A view whose items are not bytes is sized and copied as bytes."""
+        ints = array("I", [1, 2, 3])
+        client_transport.send_request_parts((b"[", memoryview(ints), b"]"))
+        assert server_transport.receive_request() == b"[" + ints.tobytes() + b"]"
@@ -1,6 +1,8 @@
 import multiprocessing
+import os
 import threading
 import time
+from array import array
 
 import posix_ipc
 import pytest
@@ -102,6 +104,87 @@ class TestSharedMemoryTransportPosix:
         transport.close()
         self._assert_ipc_resources_cleaned_up(transport)
 
+    def test_close_unmaps_buffers(self, server_transport, client_transport) -> None:
+        client_transport.send_request(b"ping")
+        assert server_transport.receive_request() == b"ping"
+        mmaps = [t.request_mmap for t in (server_transport, client_transport)] + [
+            t.response_mmap for t in (server_transport, client_transport)
+        ]
+        client_transport.close()
+        server_transport.close()
+        assert all(m.closed for m in mmaps)
+
+    def test_use_after_close_fails(self, server_transport, client_transport) -> None:
+        client_transport.close()
+        with pytest.raises(RPCTransportError):
+            client_transport.send_request(b"Request data")
+        with pytest.raises(RPCTransportError):
+            client_transport.receive_response()
+
+    @staticmethod
+    def _exit_status_in_forked_child(child) -> int:
+        """Run child in a forked child process, exiting 0 if it returns True and 1 otherwise."""
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = 0 if child() else 1
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        return status
+
+    def test_fork_then_use_fails(self, server_transport, client_transport) -> None:
+        """The child does not get the buffers: it gets RPCTransportError, not a segfault."""
+
+        def use_inherited_transports() -> bool:
+            for use in (
+                lambda: client_transport.send_request(b"Request data"),
+                client_transport.receive_response,
+                server_transport.receive_request,
+                lambda: server_transport.send_response(b"Response data"),
+            ):
+                try:
+                    use()
+                    return False
+                except RPCTransportError:
+                    pass
+            return True
+
+        assert self._exit_status_in_forked_child(use_inherited_transports) == 0
+        # the parent is unaffected
+        client_transport.send_request(b"Request data")
+        assert server_transport.receive_request() == b"Request data"
+
+    def test_fork_then_close(self, server_transport, client_transport) -> None:
+        """Closing in the child neither crashes nor tears down the objects the parent uses."""
+
+        def close_inherited_transports() -> bool:
+            client_transport.close()
+            server_transport.close()
+            return True
+
+        assert self._exit_status_in_forked_child(close_inherited_transports) == 0
+        with pytest.raises(AssertionError):
+            SharedMemoryTransportPosix.assert_no_resources_left_behind(server_transport.name)
+        client_transport.send_request(b"Request data")
+        assert server_transport.receive_request() == b"Request data"
+        server_transport.send_response(b"Response data")
+        assert client_transport.receive_response() == b"Response data"
+
+    def test_delete_resources_by_name(self, server_transport) -> None:
+        with SharedMemoryTransportPosix.create(name="t_del") as transport:
+            SharedMemoryTransportPosix.delete_resources("t_del")
+            SharedMemoryTransportPosix.assert_no_resources_left_behind(transport.name)
+        # other transports are left alone
+        self._assert_server_ipc_initialized(
+            transport=server_transport,
+            name=server_transport.name,
+            buffer_size=server_transport.buffer_size,
+        )
+        with pytest.raises(AssertionError):
+            SharedMemoryTransportPosix.assert_no_resources_left_behind(server_transport.name)
+
     def test_create_and_close_with_context_manager(self, buffer_size) -> None:
         with SharedMemoryTransportPosix.create(name="t_ctx", buffer_size=buffer_size) as transport:
             self._assert_server_ipc_initialized(
@@ -211,6 +294,32 @@ class TestSharedMemoryTransportPosix:
             received = client_transport.receive_response()
             assert received == response
 
+    def test_receive_with(self, server_transport, client_transport) -> None:
+        """decode reads the data in place, and the slot is handed back even if decode fails."""
+        client_transport.send_request(b"Request data")
+        received = server_transport.receive_request_with(lambda data: (type(data), bytes(data)))
+        assert received == (memoryview, b"Request data")
+
+        def failing_decode(data):
+            raise ValueError("cannot decode")
+
+        server_transport.send_response(b"Response data")
+        with pytest.raises(ValueError, match="cannot decode"):
+            client_transport.receive_response_with(failing_decode)
+        server_transport.send_response(b"Response data")
+        assert client_transport.receive_response() == b"Response data"
+
+    def test_send_view_of_wider_items(self, server_transport, client_transport) -> None:
+        """A view whose items are not bytes is sized and copied as bytes."""
+        ints = array("I", [1, 2, 3])
+        client_transport.send_request_parts((b"[", memoryview(ints), b"]"))
+        assert server_transport.receive_request() == b"[" + ints.tobytes() + b"]"
+        # a non-contiguous one is refused, and leaves the channel usable
+        with pytest.raises(RPCTransportError):
+            client_transport.send_request_parts((memoryview(b"abcd")[::2],))
+        client_transport.send_request(b"Request data")
+        assert server_transport.receive_request() == b"Request data"
+
     def test_message_too_large(self, buffer_size, server_transport, client_transport) -> None:
         large_data = b"x" * (buffer_size + 1)
         with pytest.raises(RPCTransportError, match="too large"):
@@ -226,6 +335,17 @@ class TestSharedMemoryTransportPosix:
         with pytest.raises(RPCTimeoutError):
             client_transport.receive_response()
 
+    @pytest.mark.parametrize("timeout", [0.1], indirect=True)
+    def test_spin_before_blocking(self, server_transport, client_transport, monkeypatch) -> None:
+        """Spinning (off on a single CPU) neither loses messages nor prevents timeouts."""
+        monkeypatch.setattr(SharedMemoryTransportPosix, "SPIN_TRIES", 16)
+        client_transport.send_request(b"Request data")
+        assert server_transport.receive_request() == b"Request data"
+        server_transport.send_response(b"Response data")
+        assert client_transport.receive_response() == b"Response data"
+        with pytest.raises(RPCTimeoutError):
+            client_transport.receive_response()
+
     @pytest.mark.parametrize("timeout", [1], indirect=True)
     def test_close_doesnt_break_acquire(self, server_transport, timeout) -> None:
         """